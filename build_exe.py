@@ -2,15 +2,55 @@
 """
 CGMSV Launcher Build Script
 This script builds the launcher into an executable file.
+
+Usage:
+    python build_exe.py                      # Build default profile (onefile)
+    python build_exe.py --profile onedir     # Build a specific profile
+    python build_exe.py --profile all        # Build and compare all profiles
 """
 
 import os
 import sys
+import time
+import argparse
+import statistics
 import subprocess
 import shutil
 from pathlib import Path
 from version import __version__
 
+APP_NAME = f"CGMSVLauncher-v{__version__}"
+
+# Standard library modules the launcher never imports
+UNUSED_STDLIB_MODULES = [
+    "unittest", "doctest", "pydoc", "pdb", "lib2to3", "distutils", "setuptools", "pip",
+    "xmlrpc", "sqlite3", "curses", "turtle", "turtledemo", "idlelib", "test",
+    "tkinter.test", "ensurepip", "venv", "pydoc_data", "mailbox", "imaplib", "nntplib",
+    "smtplib", "ftplib", "telnetlib", "cgi", "cgitb",
+]
+
+# Build profiles: PyInstaller bundle mode and extra options
+BUILD_PROFILES = {
+    "onefile": {
+        "description": "Single executable, unpacked to temp on every launch",
+        "options": ["--onefile"],
+    },
+    "onedir": {
+        "description": "Executable folder, no unpacking at startup",
+        "options": ["--onedir"],
+    },
+    "stripped": {
+        "description": "Executable folder without unused stdlib modules",
+        # --strip needs a strip binary and is not recommended on Windows
+        "options": ["--onedir", "--noupx"] + (["--strip"] if sys.platform != "win32" else [])
+                   + [f"--exclude-module={m}" for m in UNUSED_STDLIB_MODULES],
+    },
+}
+DEFAULT_PROFILE = "onefile"
+
+# Makes the launcher exit right after its first paint (see launcher_main.py)
+STARTUP_PROBE_ENV = "CGMSV_LAUNCHER_STARTUP_PROBE"
+
 def check_dependencies():
     """Check required dependencies"""
     print("🔍 Checking dependencies...")
@@ -52,28 +92,41 @@ def install_pyinstaller():
         print(f"❌ Failed to install PyInstaller: {e}")
         return False
 
-def build_executable():
+def get_dist_dir(profile):
+    """Get PyInstaller output directory of a profile"""
+    return Path("dist") / profile
+
+def get_artifact_path(profile):
+    """Get built executable path of a profile"""
+    if "--onefile" in BUILD_PROFILES[profile]["options"]:
+        return get_dist_dir(profile) / f"{APP_NAME}.exe"
+    return get_dist_dir(profile) / APP_NAME / f"{APP_NAME}.exe"
+
+def build_executable(profile=DEFAULT_PROFILE):
     """Build executable file"""
-    print(f"\n🏗️ Building CGMSV Launcher v{__version__}...")
+    print(f"\n🏗️ Building CGMSV Launcher v{__version__} ({profile})...")
     
     # PyInstaller command configuration
     cmd = [
         "pyinstaller",
-        "--onefile",                    # Create single file
+        "--noconfirm",
         "--windowed",                   # Hide console window
-        f"--name=CGMSVLauncher-v{__version__}",  # Executable name with version
+        f"--name={APP_NAME}",           # Executable name with version
+        f"--distpath={get_dist_dir(profile)}",
+        f"--workpath={Path('build') / profile}",
         "--icon=icon6.0.ico",           # Icon (if available)
         "--add-data=config.yml;.",      # Include config file
         "--add-data=version.py;.",      # Include version file
         "--hidden-import=tkinter",      # Explicitly include tkinter
         "--hidden-import=tkinter.ttk",  # Explicitly include ttk
         "--hidden-import=tkinter.filedialog",  # Explicitly include filedialog
-        "launcher_main.py"
     ]
+    cmd += BUILD_PROFILES[profile]["options"]
+    cmd.append("launcher_main.py")
     
     # Remove icon if not available
     if not os.path.exists("icon6.0.ico"):
-        cmd.remove("--icon=icon.ico")
+        cmd.remove("--icon=icon6.0.ico")
     
     try:
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
@@ -84,13 +137,62 @@ def build_executable():
         print(f"Error output: {e.stderr}")
         return False
 
-def create_distribution():
+def get_artifact_size(profile):
+    """Get total disk size of built artifact in bytes"""
+    artifact = get_artifact_path(profile)
+    if "--onefile" in BUILD_PROFILES[profile]["options"]:
+        return artifact.stat().st_size
+    return sum(f.stat().st_size for f in artifact.parent.rglob("*") if f.is_file())
+
+def measure_startup(profile, runs=5):
+    """Launch artifact repeatedly until first paint, returns list of seconds"""
+    artifact = get_artifact_path(profile)
+    # The launcher reads config.yml from its working directory; neither the onefile
+    # dist folder nor a PyInstaller 6 onedir folder (data lives in _internal/) has one
+    shutil.copy2("config.yml", artifact.parent / "config.yml")
+    env = dict(os.environ, **{STARTUP_PROBE_ENV: "1"})
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([str(artifact)], cwd=artifact.parent, env=env, timeout=120)
+        if result.returncode != 0:
+            # A startup error would otherwise be timed as a (slow) successful start
+            raise subprocess.CalledProcessError(result.returncode, str(artifact))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def measure_profile(profile, runs=5):
+    """Measure startup time and disk size of a built profile"""
+    print(f"\n⏱️ Measuring {profile} ({runs} runs)...")
+    try:
+        timings = measure_startup(profile, runs)
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f"❌ Startup measurement failed: {e}")
+        return None
+    result = {
+        "profile": profile,
+        "first": timings[0],
+        "median": statistics.median(timings),
+        "size": get_artifact_size(profile),
+    }
+    print(f"✅ {profile}: first {result['first']:.2f}s, median {result['median']:.2f}s, {result['size'] / 1024 / 1024:.1f} MB")
+    return result
+
+def print_report(results):
+    """Print measured profiles side by side"""
+    print("\n📊 Build profile comparison")
+    print(f"{'Profile':<10} {'First start':>12} {'Median start':>13} {'Disk size':>11}  Description")
+    for result in sorted(results, key=lambda r: r["median"]):
+        print(f"{result['profile']:<10} {result['first']:>11.2f}s {result['median']:>12.2f}s "
+              f"{result['size'] / 1024 / 1024:>8.1f} MB  {BUILD_PROFILES[result['profile']]['description']}")
+
+def create_distribution(profile=DEFAULT_PROFILE):
     """Create distribution package"""
     print("\n📦 Creating distribution package...")
     
-    dist_dir = Path("dist")
-    if not dist_dir.exists():
-        print("❌ dist directory not found. Build may have failed.")
+    artifact = get_artifact_path(profile)
+    if not artifact.exists():
+        print(f"❌ Executable not found: {artifact}. Build may have failed.")
         return False
     
     # Create distribution folder
@@ -99,14 +201,12 @@ def create_distribution():
         shutil.rmtree(package_dir)
     package_dir.mkdir()
     
-    # Copy executable
-    exe_file = dist_dir / f"CGMSVLauncher-v{__version__}.exe"
-    if exe_file.exists():
-        shutil.copy2(exe_file, package_dir)
-        print(f"✅ Copied {exe_file.name}")
+    # Copy executable (onedir profiles ship the whole bundle folder)
+    if "--onefile" in BUILD_PROFILES[profile]["options"]:
+        shutil.copy2(artifact, package_dir)
     else:
-        print(f"❌ Executable not found: {exe_file}")
-        return False
+        shutil.copytree(artifact.parent, package_dir, dirs_exist_ok=True)
+    print(f"✅ Copied {artifact.name}")
     
     # Copy config file
     if os.path.exists("config.yml"):
@@ -188,8 +288,22 @@ Release Notes:
         f.write(version_info)
     print("✅ Created VERSION.txt")
 
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Build CGMSV Launcher executable")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(BUILD_PROFILES) + ["all"],
+                        help="build profile to use, or 'all' to build and compare every profile")
+    parser.add_argument("--runs", type=int, default=5, help="startup measurement runs per profile")
+    parser.add_argument("--no-measure", action="store_true", help="skip startup/size measurement")
+    parser.add_argument("--package", choices=list(BUILD_PROFILES),
+                        help="profile to package (default: the built profile, or the fastest one with --profile all)")
+    return parser.parse_args()
+
 def main():
     """Main build process"""
+    args = parse_args()
+    profiles = list(BUILD_PROFILES) if args.profile == "all" else [args.profile]
+    
     print(f"🚀 CGMSV Launcher v{__version__} Build Process")
     print("=" * 50)
     
@@ -205,12 +319,24 @@ def main():
         if not install_pyinstaller():
             return False
     
-    # 3. Execute build
-    if not build_executable():
-        return False
+    # 3. Execute build and measure each profile
+    results = []
+    for profile in profiles:
+        if not build_executable(profile):
+            return False
+        if not args.no_measure:
+            result = measure_profile(profile, args.runs)
+            if result:
+                results.append(result)
+    
+    if results:
+        print_report(results)
     
     # 4. Create distribution package
-    if not create_distribution():
+    package_profile = args.package
+    if package_profile is None:
+        package_profile = min(results, key=lambda r: r["median"])["profile"] if results else profiles[0]
+    if not create_distribution(package_profile):
         return False
     
     print(f"\n🎉 CGMSV Launcher v{__version__} build process completed successfully!")
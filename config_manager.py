@@ -1,10 +1,17 @@
 import yaml
 import os
 
+# Sections refreshed when config.yml changes mid-session (what launch plans are compiled from);
+# everything else keeps the values the running managers were started with
+RELOADABLE_SECTIONS = ('profiles', 'positions', 'default_params')
+
 class ConfigManager:
     def __init__(self, config_file='config.yml'):
         self.config_file = config_file
+        self.config_mtime = self.get_config_mtime()
         self.config = self.load_config()
+        self.version = 0  # Incremented whenever the config is reloaded
+        self.reload_error = None  # Why the last reload was rejected (None if it succeeded)
     
     def load_config(self):
         """Load config file"""
@@ -18,10 +25,41 @@ class ConfigManager:
             print(f"Error loading config: {e}")
             return self.get_default_config()
     
+    def get_config_mtime(self):
+        """Get config file modification time (None if missing)"""
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_if_changed(self):
+        """Refresh profile data when the file changed on disk, returns True if reloaded"""
+        mtime = self.get_config_mtime()
+        if mtime == self.config_mtime:
+            return False
+        self.config_mtime = mtime
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                new_config = yaml.safe_load(f)
+            if not isinstance(new_config, dict):
+                raise ValueError("config is empty or not a mapping")
+        except Exception as e:
+            # Keep running with the previous config until the file is fixed
+            self.reload_error = str(e)
+            return False
+        self.reload_error = None
+        for section in RELOADABLE_SECTIONS:
+            if section in new_config:
+                self.config[section] = new_config[section]
+        if 'position' in new_config.get('defaults', {}):
+            self.config['defaults']['position'] = new_config['defaults']['position']
+        self.version += 1
+        return True
+    
     def get_default_config(self):
         """Get default configuration"""
         return {
-            'launcher': {'title': 'CGMSV Launcher', 'window_size': '900x700', 'log_height': 12},
+            'launcher': {'title': 'CGMSV Launcher', 'window_size': '900x700', 'log_height': 12, 'log_max_entries': 200000, 'log_refresh_interval_ms': 100},
             'ui': {
                 'add_program': {'title': 'Add New CG', 'program_label': 'CG Program:', 'program_placeholder': 'Please select a CG program'},
                 'program_list': {'title': 'Running CGs'},
@@ -43,7 +81,21 @@ class ConfigManager:
                 'errors': {'no_program_selected': '❌ Please select a CG program first.'}
             },
             'default_params': '',
-            'monitoring': {'check_interval': 5, 'max_position_attempts': 10, 'position_attempt_interval': 2, 'timeout': 5}
+            'monitoring': {'check_interval': 5, 'max_position_attempts': 10, 'position_attempt_interval': 2, 'timeout': 5,
+                           'drift_check_interval': 5, 'drift_tolerance': 2, 'snapshot_max_age': 1.0},
+            'profiles': [],
+            'pid_registry': {'file': ''},
+            'capture': {'enabled': False, 'log_dir': 'client_logs', 'max_bytes': 5242880, 'backup_count': 3, 'read_chunk': 65536},
+            'launch_journal': {'temp_dir': '', 'min_orphan_age': 60},
+            'diagnostics': {'rss_sample_interval': 60, 'rss_samples': 1440, 'top_allocators': 10, 'traceback_frames': 1},
+            'sharding': {'enabled': False, 'workers': 0, 'batch_interval_ms': 100, 'command_timeout': 30},
+            'metrics': {'enabled': False, 'host': '127.0.0.1', 'port': 9464, 'sample_interval': 5},
+            'rotation': {'enabled': False, 'policy': 'uptime', 'max_uptime_hours': 6, 'schedule': '0 4 * * *',
+                         'batch_size': 2, 'max_offline': 2, 'online_timeout': 60, 'settle_seconds': 10, 'check_interval': 30},
+            'focus_priority': {'enabled': False, 'poll_interval_ms': 200, 'debounce_ms': 500,
+                               'focused_priority': 'above_normal', 'background_priority': 'below_normal'},
+            'integrity': {'verify_before_launch': False, 'manifest_dir': 'manifests', 'workers': 0},
+            'server_probe': {'enabled': False, 'timeout': 3, 'cache_seconds': 10, 'block_on_failure': False}
         }
     
     def get_message(self, message_key, **kwargs):
@@ -0,0 +1,155 @@
+import time
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+@dataclass(frozen=True)
+class ProgramLaunched:
+    program_id: int
+    name: str
+    position: tuple
+    restart: bool = False  # True when relaunched automatically (restart policy after the CG closed, or rotation)
+    timestamp: float = field(default_factory=time.time)
+
+@dataclass(frozen=True)
+class PidResolved:
+    program_id: int
+    pid: int
+    timestamp: float = field(default_factory=time.time)
+
+@dataclass(frozen=True)
+class WindowPlaced:
+    program_id: int
+    pid: int
+    position: tuple
+    latency: float  # seconds from launch to placement
+    timestamp: float = field(default_factory=time.time)
+
+@dataclass(frozen=True)
+class WindowMoved:
+    program_id: int
+    position: tuple
+    source: str  # 'manual' or 'drift'
+    timestamp: float = field(default_factory=time.time)
+
+@dataclass(frozen=True)
+class ProgramExited:
+    program_id: int
+    pid: int
+    reason: str  # 'closed' or 'terminated'
+    timestamp: float = field(default_factory=time.time)
+
+@dataclass(frozen=True)
+class SweepCompleted:
+    duration: float  # seconds the monitor took to check every CG
+    programs: int
+    shard: int = 0  # Shard worker that ran the sweep (0 when not sharded)
+    timestamp: float = field(default_factory=time.time)
+
+PROGRAM_EVENTS = (ProgramLaunched, PidResolved, WindowPlaced, WindowMoved, ProgramExited)
+
+class EventBus:
+    """Publish/subscribe hub for launcher state changes
+
+    Batched handlers get one call per coalesce_interval. Bursts longer than that
+    (e.g. a slow monitor sweep) are only delivered as one batch when the publishing
+    thread wraps them in hold().
+    """
+    def __init__(self, coalesce_interval=0.05):
+        self.coalesce_interval = coalesce_interval
+        self.subscribers = {}  # {event_type: [handler, ...]} - called on publisher thread
+        self.batched = []  # [[event_types, handler, pending_events], ...] - called once per burst
+        self.condition = threading.Condition()
+        self.dispatch_thread = None
+        self.holds = {}  # {thread_ident: [events]} - batched events a thread holds back until its block ends
+        self.error_handler = None  # Called with the exception when a batched handler fails
+
+    def subscribe(self, event_type, handler):
+        """Call handler(event) synchronously for every event of type"""
+        with self.condition:
+            self.subscribers.setdefault(event_type, []).append(handler)
+
+    def subscribe_batched(self, event_types, handler):
+        """Call handler([events]) once per burst of events of the given types"""
+        with self.condition:
+            self.batched.append([tuple(event_types), handler, []])
+            if self.dispatch_thread is None:
+                self.dispatch_thread = threading.Thread(target=self.dispatch_batches, daemon=True)
+                self.dispatch_thread.start()
+
+    def unsubscribe(self, handler):
+        """Remove handler from all subscriptions"""
+        with self.condition:
+            for handlers in self.subscribers.values():
+                if handler in handlers:
+                    handlers.remove(handler)
+            self.batched = [entry for entry in self.batched if entry[1] != handler]
+
+    def publish(self, event):
+        """Deliver event to subscribers"""
+        with self.condition:
+            handlers = list(self.subscribers.get(type(event), ()))
+            held = self.holds.get(threading.get_ident())
+            if held is not None:
+                held.append(event)
+            elif self._queue(event):
+                self.condition.notify()
+        for handler in handlers:
+            handler(event)
+
+    def _queue(self, event):
+        """Add event to matching batched subscriptions (caller holds the condition), returns True if queued"""
+        queued = False
+        for event_types, _, pending in self.batched:
+            if isinstance(event, event_types):
+                pending.append(event)
+                queued = True
+        return queued
+
+    def is_holding(self):
+        """Check if the calling thread is inside hold()"""
+        return threading.get_ident() in self.holds
+
+    @contextmanager
+    def hold(self):
+        """Queue this thread's batched events only when the block ends, so they arrive as one batch
+
+        Events published by other threads meanwhile are delivered as usual.
+        """
+        ident = threading.get_ident()
+        with self.condition:
+            nested = ident in self.holds
+            if not nested:
+                self.holds[ident] = []
+        try:
+            yield
+        finally:
+            if not nested:
+                with self.condition:
+                    queued = False
+                    for event in self.holds.pop(ident):
+                        queued = self._queue(event) or queued
+                    if queued:
+                        self.condition.notify()
+
+    def dispatch_batches(self):
+        """Deliver queued events, waiting coalesce_interval so a burst becomes one call"""
+        while True:
+            with self.condition:
+                while not any(entry[2] for entry in self.batched):
+                    self.condition.wait()
+            time.sleep(self.coalesce_interval)
+            with self.condition:
+                ready = []
+                for entry in self.batched:
+                    if entry[2]:
+                        ready.append((entry[1], entry[2]))
+                        entry[2] = []
+            for handler, events in ready:
+                try:
+                    handler(events)
+                except Exception as e:
+                    if self.error_handler is not None:
+                        self.error_handler(e)
+                    else:
+                        print(f"Event handler error: {e}")
@@ -0,0 +1,134 @@
+import sys
+import time
+import threading
+from collections import deque
+
+import psutil
+
+from placement_manager import get_default_backend
+
+# Windows priority classes, with nice values as the fallback on other platforms
+PRIORITY_LEVELS = {
+    'high': ('HIGH_PRIORITY_CLASS', -10),
+    'above_normal': ('ABOVE_NORMAL_PRIORITY_CLASS', -5),
+    'normal': ('NORMAL_PRIORITY_CLASS', 0),
+    'below_normal': ('BELOW_NORMAL_PRIORITY_CLASS', 5),
+    'idle': ('IDLE_PRIORITY_CLASS', 19),
+}
+
+def resolve_priority(name):
+    """Map priority name from config to a psutil nice value"""
+    class_name, nice_value = PRIORITY_LEVELS[name]
+    if sys.platform == 'win32':
+        return getattr(psutil, class_name)
+    return nice_value
+
+class FocusPriorityManager:
+    """Raises the priority of the focused CG and lowers the others"""
+    def __init__(self, config_manager, logger, program_manager, focus_source=None):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.program_manager = program_manager
+        self.focus_source = focus_source if focus_source is not None else get_default_backend()
+        self.settings = config_manager.config.get('focus_priority', {})
+        self.poll_interval = self.settings.get('poll_interval_ms', 200) / 1000
+        self.debounce = self.settings.get('debounce_ms', 500) / 1000
+        self.focused_priority = resolve_priority(self.settings.get('focused_priority', 'above_normal'))
+        self.background_priority = resolve_priority(self.settings.get('background_priority', 'below_normal'))
+        self.normal_priority = resolve_priority('normal')
+
+        self.candidate = None  # (pid, first_seen) of focus not yet applied
+        self.focused_pid = None
+        self.applied = {}  # {pid: priority} - avoids repeating syscalls
+        self.switch_latencies = deque(maxlen=100)  # seconds from focus change to priorities applied
+        self.thread = None
+        self.is_running = False
+
+    def is_enabled(self):
+        """Check if focus-aware priority is enabled"""
+        return self.settings.get('enabled', False) and self.focus_source is not None
+
+    def start(self):
+        """Start polling the focus source"""
+        if not self.is_enabled() or (self.thread and self.thread.is_alive()):
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop polling and restore normal priority"""
+        self.is_running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+        for pid in list(self.applied):
+            self.set_priority(pid, self.normal_priority)
+        self.applied.clear()
+
+    def run(self):
+        """Polling loop"""
+        while self.is_running:
+            try:
+                self.tick()
+            except Exception as e:
+                self.logger.log(self.config_manager.get_message('focus.error', error=str(e)))
+            time.sleep(self.poll_interval)
+
+    def get_tracked_pids(self):
+        """{pid: program_id} of CGs with a known PID"""
+        return {info['pid']: program_id for program_id, info in list(self.program_manager.get_programs().items()) if info.get('pid')}
+
+    def tick(self, now=None):
+        """Sample focus once and apply priorities when a change has been stable for debounce seconds"""
+        if now is None:
+            now = time.monotonic()
+        tracked = self.get_tracked_pids()
+
+        # Forget exited CGs
+        for pid in [pid for pid in self.applied if pid not in tracked]:
+            del self.applied[pid]
+
+        pid = self.focus_source.get_foreground_pid()
+        if pid not in tracked:
+            # Launcher or another app focused: keep the last CG's boost
+            pid = self.focused_pid
+
+        if pid == self.focused_pid:
+            self.candidate = None
+        elif self.candidate is None or self.candidate[0] != pid:
+            self.candidate = (pid, now)
+        elif now - self.candidate[1] >= self.debounce:
+            first_seen = self.candidate[1]
+            self.candidate = None
+            self.focused_pid = pid
+            apply_started = time.perf_counter()
+            self.apply(tracked)
+            # Time the user waited: debounce plus the priority syscalls
+            latency = (now - first_seen) + (time.perf_counter() - apply_started)
+            self.switch_latencies.append(latency)
+            self.logger.log(self.config_manager.get_message('focus.switched', id=tracked[pid], latency=f"{latency * 1000:.0f}"))
+            return
+
+        # Newly launched CGs start in the background class
+        for tracked_pid in tracked:
+            if tracked_pid not in self.applied:
+                self.set_priority(tracked_pid, self.focused_priority if tracked_pid == self.focused_pid else self.background_priority)
+
+    def apply(self, tracked):
+        """Set focused/background priority, touching only processes whose class changes"""
+        for pid in tracked:
+            self.set_priority(pid, self.focused_priority if pid == self.focused_pid else self.background_priority)
+
+    def set_priority(self, pid, priority):
+        """Set process priority if it differs from the last applied one"""
+        if self.applied.get(pid) == priority:
+            return
+        try:
+            psutil.Process(pid).nice(priority)
+            self.applied[pid] = priority
+        except psutil.NoSuchProcess:
+            self.applied.pop(pid, None)
+        except psutil.AccessDenied as e:
+            # Remember anyway so we do not retry every tick
+            self.applied[pid] = priority
+            self.logger.log(self.config_manager.get_message('focus.error', error=str(e)))
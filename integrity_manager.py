@@ -0,0 +1,170 @@
+import os
+import json
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+HASH_CHUNK_SIZE = 1024 * 1024  # Read files 1 MB at a time
+
+
+def hash_file(path):
+    """Hash a single file in fixed-size chunks (runs in worker processes)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_files(root_dir):
+    """Walk install directory lazily, yielding (relative_path, stat_result)"""
+    stack = [root_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        rel_path = os.path.relpath(entry.path, root_dir).replace(os.sep, '/')
+                        yield rel_path, entry.stat()
+        except OSError:
+            continue
+
+
+class IntegrityManager:
+    def __init__(self, config_manager, logger):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.settings = config_manager.config.get('integrity', {})
+        self.manifest_dir = self.settings.get('manifest_dir', 'manifests')
+        self.workers = self.settings.get('workers') or os.cpu_count() or 1
+
+    def is_enabled(self):
+        """Check if pre-launch verification is enabled"""
+        return self.settings.get('verify_before_launch', False)
+
+    def get_manifest_path(self, install_dir):
+        """Get manifest file path for install directory"""
+        key = hashlib.blake2b(os.path.normcase(os.path.abspath(install_dir)).encode('utf-8'), digest_size=8).hexdigest()
+        return os.path.join(self.manifest_dir, f"manifest_{key}.json")
+
+    def load_manifest(self, install_dir):
+        """Load manifest ({rel_path: [size, mtime_ns, hash]})"""
+        try:
+            with open(self.get_manifest_path(install_dir), 'r', encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save_manifest(self, install_dir, files):
+        """Save manifest atomically"""
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        manifest_path = self.get_manifest_path(install_dir)
+        fd, temp_path = tempfile.mkstemp(dir=self.manifest_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'install_dir': os.path.abspath(install_dir), 'files': files}, f)
+            os.replace(temp_path, manifest_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _hash_changed(self, install_dir, changed):
+        """Hash (rel_path, stat) pairs in a process pool, keeping a bounded number in flight"""
+        results = {}
+        max_pending = self.workers * 4
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            for rel_path, stat in changed:
+                future = executor.submit(hash_file, os.path.join(install_dir, rel_path))
+                pending[future] = (rel_path, stat)
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        self._collect(finished, pending.pop(finished), results)
+            for finished in list(pending):
+                self._collect(finished, pending.pop(finished), results)
+        return results
+
+    def _collect(self, future, item, results):
+        """Store hash result of a finished future"""
+        rel_path, stat = item
+        try:
+            results[rel_path] = [stat.st_size, stat.st_mtime_ns, future.result()]
+        except OSError as e:
+            self.logger.log(self.config_manager.get_message('integrity.hash_error', path=rel_path, error=str(e)))
+
+    def update_manifest(self, install_dir):
+        """Build or refresh manifest, re-hashing only files whose size/mtime changed"""
+        old_files = self.load_manifest(install_dir) or {}
+        files = {}
+
+        def changed_files():
+            for rel_path, stat in iter_files(install_dir):
+                entry = old_files.get(rel_path)
+                if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                    files[rel_path] = entry
+                else:
+                    yield rel_path, stat
+
+        rehashed = self._hash_changed(install_dir, changed_files())
+        files.update(rehashed)
+        self.save_manifest(install_dir, files)
+        self.logger.log(self.config_manager.get_message('integrity.manifest_updated', total=len(files), rehashed=len(rehashed)))
+        return files
+
+    def verify(self, install_dir):
+        """Verify install directory against its manifest, returns (ok, problems)"""
+        files = self.load_manifest(install_dir)
+        if files is None:
+            return False, [self.config_manager.get_message('integrity.no_manifest', path=install_dir)]
+
+        problems = []
+        changed = []
+        for rel_path, (size, mtime_ns, _) in files.items():
+            try:
+                stat = os.stat(os.path.join(install_dir, rel_path))
+            except OSError:
+                problems.append(self.config_manager.get_message('integrity.file_missing', path=rel_path))
+                continue
+            if stat.st_size != size:
+                problems.append(self.config_manager.get_message('integrity.file_modified', path=rel_path))
+            elif stat.st_mtime_ns != mtime_ns:
+                changed.append((rel_path, stat))
+
+        # Touched but same size: only these need hashing to decide
+        if changed:
+            rehashed = self._hash_changed(install_dir, changed)
+            for rel_path, stat in changed:
+                entry = rehashed.get(rel_path)
+                if entry is None or entry[2] != files[rel_path][2]:
+                    problems.append(self.config_manager.get_message('integrity.file_modified', path=rel_path))
+                else:
+                    files[rel_path] = entry
+            if not problems:
+                # Remember new mtimes so the next check is stat-only again
+                self.save_manifest(install_dir, files)
+
+        return not problems, problems
+
+    def check_before_launch(self, program_path):
+        """Fast pass/fail check used before launching a CG"""
+        install_dir = os.path.dirname(os.path.abspath(program_path))
+        if self.load_manifest(install_dir) is None:
+            # The baseline is only recorded by Update Manifest, never from whatever state the install is in now
+            self.logger.log(self.config_manager.get_message('integrity.not_verified', path=install_dir))
+            return True
+        ok, problems = self.verify(install_dir)
+        if ok:
+            self.logger.log(self.config_manager.get_message('integrity.verify_passed', path=install_dir))
+            return True
+        for problem in problems[:10]:
+            self.logger.log(problem)
+        self.logger.log(self.config_manager.get_message('integrity.verify_failed', path=install_dir, count=len(problems)))
+        return False
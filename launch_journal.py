@@ -0,0 +1,135 @@
+import os
+import re
+import json
+import time
+import tempfile
+import threading
+
+import psutil
+
+JOURNAL_PATTERN = re.compile(r'^cgmsv_journal_(?P<session>[0-9a-f]+-[0-9a-f]+)\.json$')
+ARTIFACT_PATTERN = re.compile(r'^cgmsv_(?P<session>[0-9a-f]+-[0-9a-f]+)_\d+\.bat$')
+LEGACY_PATTERN = re.compile(r'^temp_program_\d+\.bat$')
+
+class LaunchJournal:
+    """Per-session record of temp artifacts, so a killed launcher's leftovers can be reaped"""
+    def __init__(self, config_manager, logger):
+        self.config_manager = config_manager
+        self.logger = logger
+        settings = config_manager.config.get('launch_journal', {})
+        self.temp_dir = settings.get('temp_dir') or tempfile.gettempdir()
+        self.min_orphan_age = settings.get('min_orphan_age', 60)
+        process = psutil.Process()
+        self.owner = [process.pid, process.create_time()]
+        self.session_id = f"{process.pid:x}-{int(process.create_time() * 1000):x}"
+        self.journal_path = os.path.join(self.temp_dir, f"cgmsv_journal_{self.session_id}.json")
+        self.artifacts = {}  # {program_id: path}
+        self.lock = threading.Lock()
+
+    def artifact_path(self, program_id):
+        """Unique temp batch file path for a CG of this session"""
+        return os.path.join(self.temp_dir, f"cgmsv_{self.session_id}_{program_id}.bat")
+
+    def _write(self):
+        """Write journal atomically (caller holds the lock)"""
+        if not self.artifacts:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            return
+        temp_path = self.journal_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'owner': self.owner, 'artifacts': list(self.artifacts.values())}, f)
+        os.replace(temp_path, self.journal_path)
+
+    def record(self, program_id, path):
+        """Journal an artifact before it is created"""
+        with self.lock:
+            self.artifacts[program_id] = path
+            self._write()
+
+    def remove(self, program_id):
+        """Forget an artifact after it was deleted"""
+        with self.lock:
+            if self.artifacts.pop(program_id, None) is not None:
+                self._write()
+
+    def _owner_alive(self, owner):
+        """Check if a journal's launcher is still running"""
+        try:
+            return abs(psutil.Process(owner[0]).create_time() - owner[1]) < 0.01
+        except (psutil.Error, TypeError, IndexError):
+            return False
+
+    def _remove_file(self, path, removed):
+        """Delete file, collecting its path on success"""
+        try:
+            os.remove(path)
+            removed.append(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.log(self.config_manager.get_message('journal.remove_failed', path=path, error=str(e)))
+
+    def reap(self):
+        """Delete artifacts left behind by launchers that are no longer running, returns removed paths"""
+        removed = []
+        live_sessions = {self.session_id}
+        candidates = []  # (path, session, mtime) of batch files not yet accounted for
+        now = time.time()
+
+        journals = []  # (path, session)
+        with os.scandir(self.temp_dir) as entries:
+            for entry in entries:
+                match = JOURNAL_PATTERN.match(entry.name) or ARTIFACT_PATTERN.match(entry.name) or LEGACY_PATTERN.match(entry.name)
+                if not match:
+                    continue
+                if match.re is JOURNAL_PATTERN:
+                    journals.append((entry.path, match.group('session')))
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                session = match.group('session') if match.re is ARTIFACT_PATTERN else None
+                candidates.append((entry.path, session, mtime))
+
+        # Journals of dead launchers list exactly what they left behind
+        for path, session in journals:
+            if session == self.session_id:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    journal = json.load(f)
+            except (OSError, ValueError):
+                # Possibly caught mid-replace by its owner: treat as alive rather than reap a live launcher's files
+                live_sessions.add(session)
+                continue
+            if self._owner_alive(journal.get('owner')):
+                live_sessions.add(session)
+                continue
+            for artifact in journal.get('artifacts', []):
+                self._remove_file(artifact, removed)
+            self._remove_file(path, removed)
+
+        # Batch files without a live journal (e.g. journal lost, or written by older versions)
+        for path, session, mtime in candidates:
+            if session in live_sessions or path in removed or now - mtime < self.min_orphan_age:
+                continue
+            self._remove_file(path, removed)
+        return removed
+
+    def start_reaper(self):
+        """Reap orphaned artifacts in background so startup is not blocked"""
+        def reap():
+            try:
+                removed = self.reap()
+            except OSError as e:
+                self.logger.log(self.config_manager.get_message('journal.reap_failed', error=str(e)))
+                return
+            if removed:
+                self.logger.log(self.config_manager.get_message('journal.reaped', count=len(removed)))
+                for path in removed[:20]:
+                    self.logger.log(self.config_manager.get_message('journal.reaped_file', path=path))
+        thread = threading.Thread(target=reap, daemon=True)
+        thread.start()
+        return thread
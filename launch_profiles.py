@@ -0,0 +1,98 @@
+import os
+import shlex
+from typing import NamedTuple, Optional, Tuple
+
+RESTART_POLICIES = ('never', 'on_exit')
+
+def split_params(params):
+    """Split parameter string into argv tokens (Windows quoting, quotes removed)"""
+    tokens = shlex.split(params, posix=False)
+    return [t[1:-1] if len(t) >= 2 and t[0] == t[-1] == '"' else t for t in tokens]
+
+class LaunchPlan(NamedTuple):
+    """Everything needed to start a CG, resolved ahead of time"""
+    name: str
+    path: str
+    program_dir: str
+    program_name: str
+    process_name: str
+    params: str
+    argv: Tuple[str, ...]
+    position: Tuple[int, int]
+    position_label: str
+    affinity: Optional[Tuple[int, ...]] = None
+    restart: str = 'never'
+    max_restarts: int = 0
+
+def compile_plan(config_manager, name, exe, params, slot, affinity=None, restart='never', max_restarts=0):
+    """Resolve paths, slot and argv of a CG launch once"""
+    if slot not in config_manager.config['positions']:
+        raise ValueError(f"unknown slot '{slot}'")
+    if restart not in RESTART_POLICIES:
+        raise ValueError(f"unknown restart policy '{restart}'")
+    path = os.path.abspath(exe)
+    program_name = os.path.basename(path)
+    position = config_manager.get_position_coords(slot)
+    return LaunchPlan(
+        name=name,
+        path=path,
+        program_dir=os.path.dirname(path),
+        program_name=program_name,
+        process_name=os.path.splitext(program_name)[0],
+        params=params,
+        argv=tuple([path] + split_params(params)),
+        position=position,
+        position_label=config_manager.get_position_name(position),
+        affinity=tuple(affinity) if affinity else None,
+        restart=restart,
+        max_restarts=max_restarts,
+    )
+
+class ProfileManager:
+    """Compiles named profiles from config.yml into launch plans"""
+    def __init__(self, config_manager, logger):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.plans = {}
+        self.compiled_version = None
+        self.reported_error = None
+
+    def get_plans(self):
+        """Get {name: LaunchPlan}, recompiled only after config.yml changed"""
+        self.config_manager.reload_if_changed()
+        error = self.config_manager.reload_error
+        if error is not None and error != self.reported_error:
+            self.logger.log(self.config_manager.get_message('profiles.reload_failed', error=error))
+        self.reported_error = error
+        if self.compiled_version != self.config_manager.version:
+            self.plans = self.compile_all()
+            self.compiled_version = self.config_manager.version
+        return self.plans
+
+    def get_plan(self, name):
+        """Get launch plan of a profile"""
+        return self.get_plans().get(name)
+
+    def compile_all(self):
+        """Compile every profile in config, skipping invalid ones"""
+        config = self.config_manager.config
+        default_params = config.get('default_params', '')
+        default_slot = config['defaults']['position']
+        plans = {}
+        for profile in config.get('profiles') or []:
+            name = profile.get('name', '')
+            try:
+                exe = profile['exe']
+                if not os.path.exists(exe):
+                    raise ValueError(f"file not found: {exe}")
+                plans[name] = compile_plan(
+                    self.config_manager, name, exe,
+                    profile.get('params') or default_params,
+                    profile.get('slot', default_slot),
+                    profile.get('affinity'),
+                    profile.get('restart', 'never'),
+                    profile.get('max_restarts', 3),
+                )
+            except (KeyError, ValueError, TypeError) as e:
+                self.logger.log(self.config_manager.get_message('profiles.invalid_profile', name=name, error=str(e)))
+        return plans
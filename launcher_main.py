@@ -1,12 +1,19 @@
 import tkinter as tk
 import time
 import os
+import multiprocessing
 
 from config_manager import ConfigManager
 from program_manager import ProgramManager
+from shard_manager import ShardedProgramManager
 from ui_manager import UIManager
 from monitor_manager import MonitorManager
 from logger import Logger
+from event_bus import EventBus
+from memory_diagnostics import MemoryDiagnostics
+from focus_manager import FocusPriorityManager
+from metrics_exporter import MetricsExporter
+from rotation_scheduler import RotationScheduler
 from version import __version__
 
 class CGMSVLauncher:
@@ -15,28 +22,52 @@ class CGMSVLauncher:
         
         # Initialize managers
         self.config_manager = ConfigManager()
-        self.logger = Logger()
-        self.program_manager = ProgramManager(self.config_manager, self.logger)
+        self.logger = Logger(self.config_manager.config['launcher'].get('log_max_entries', 200000))
+        self.event_bus = EventBus()
+        self.logger.subscribe_events(self.event_bus, self.config_manager)
+        self.sharded = self.config_manager.config.get('sharding', {}).get('enabled', False)
+        if self.sharded:
+            self.program_manager = ShardedProgramManager(self.config_manager, self.logger, self.event_bus)
+        else:
+            self.program_manager = ProgramManager(self.config_manager, self.logger, self.event_bus)
         
         # Apply launcher settings with version
         title = f"{self.config_manager.config['launcher']['title']} v{__version__}"
         self.root.title(title)
         self.root.geometry(self.config_manager.config['launcher']['window_size'])
         
-        # Initialize UI
-        self.ui_manager = UIManager(self.root, self.config_manager, self.program_manager, self.logger)
+        # Track memory use over the session
+        self.memory_diagnostics = MemoryDiagnostics(self.config_manager, self.logger, self.program_manager)
+        self.memory_diagnostics.start_rss_sampling()
         
-        # Set log widget reference
-        self.logger.set_log_widget(self.ui_manager.log_text)
+        # Initialize UI
+        self.ui_manager = UIManager(self.root, self.config_manager, self.program_manager, self.logger, self.memory_diagnostics)
         
-        # Initialize monitor with UI manager reference
-        self.monitor_manager = MonitorManager(self.config_manager, self.program_manager, self.logger, self.ui_manager)
+        # Initialize monitor (UI follows state changes through the event bus)
+        self.monitor_manager = MonitorManager(self.config_manager, self.program_manager, self.logger)
         
         # Close all CGs when launcher closes
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
-        # Start monitoring
-        self.monitor_manager.start_monitoring()
+        # Start monitoring (shard workers monitor their own CGs)
+        if not self.sharded:
+            self.monitor_manager.start_monitoring()
+        
+        # Boost the focused CG (foreground window comes from the placement backend)
+        self.focus_manager = FocusPriorityManager(self.config_manager, self.logger, self.program_manager,
+                                                  self.monitor_manager.placement_verifier.backend)
+        self.focus_manager.start()
+        
+        # Serve fleet metrics on localhost
+        self.metrics_exporter = MetricsExporter(self.config_manager, self.logger, self.program_manager)
+        self.metrics_exporter.start()
+        
+        # Restart long-running CGs on schedule
+        self.rotation_scheduler = RotationScheduler(self.config_manager, self.logger, self.program_manager)
+        self.rotation_scheduler.start()
+        
+        # Clean up temp files left by launchers that were killed (in background)
+        self.program_manager.launch_journal.start_reaper()
         
         # Log startup message
         self.logger.log(f"CGMSV Launcher v{__version__} started successfully")
@@ -44,14 +75,24 @@ class CGMSVLauncher:
     def on_closing(self):
         """Close launcher and terminate all CGs"""
         self.logger.log(self.config_manager.get_message('launcher_closing'))
+        self.rotation_scheduler.stop()
         self.program_manager.terminate_all_programs()
         self.monitor_manager.stop_monitoring()
+        self.focus_manager.stop()
+        self.metrics_exporter.stop()
+        if self.sharded:
+            self.program_manager.shutdown()
         time.sleep(2)  # Wait for termination
         self.root.destroy()
 
 def main():
+    # Required for the integrity hashing process pool in frozen builds
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = CGMSVLauncher(root)
+    # Used by build_exe.py to time cold start: exit right after the first paint
+    if os.environ.get('CGMSV_LAUNCHER_STARTUP_PROBE'):
+        root.after_idle(root.destroy)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+import tkinter as tk
+from tkinter import ttk
+
+from logger import LEVELS
+
+class LogView(ttk.Frame):
+    """Log panel that renders only the visible window of a LogStore"""
+    def __init__(self, parent, store, config):
+        super().__init__(parent)
+        self.store = store
+        self.config = config
+        log_config = config['ui']['log']
+        self.rows = config['launcher']['log_height']
+        self.refresh_interval = config['launcher'].get('log_refresh_interval_ms', 100)
+        self.all_label = log_config.get('filter_all', 'All')
+
+        self.matches = []  # Sequence numbers passing the current filters
+        self.top = 0  # Index into matches of the first visible line
+        self.follow = True  # Stick to newest entry
+        self.seen_seq = -1
+        self.rendered = None
+        self.filters_changed = True
+
+        # Filter bar
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Label(filter_frame, text=log_config.get('program_filter_label', 'CG:')).pack(side=tk.LEFT)
+        self.program_filter = tk.StringVar(value=self.all_label)
+        self.program_combo = ttk.Combobox(filter_frame, textvariable=self.program_filter, width=6,
+                                          values=[self.all_label], postcommand=self.update_program_choices)
+        self.program_combo.pack(side=tk.LEFT, padx=(5, 10))
+
+        ttk.Label(filter_frame, text=log_config.get('level_filter_label', 'Level:')).pack(side=tk.LEFT)
+        self.level_filter = tk.StringVar(value=self.all_label)
+        ttk.Combobox(filter_frame, textvariable=self.level_filter, width=9, state='readonly',
+                     values=[self.all_label] + list(LEVELS)).pack(side=tk.LEFT, padx=(5, 10))
+
+        ttk.Label(filter_frame, text=log_config.get('search_label', 'Search:')).pack(side=tk.LEFT)
+        self.search_text = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.search_text).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+
+        for var in (self.program_filter, self.level_filter, self.search_text):
+            var.trace_add('write', self.on_filter_change)
+
+        # Text widget holds only the visible rows
+        text_frame = ttk.Frame(self)
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        self.text = tk.Text(text_frame, height=self.rows, wrap=tk.NONE, state=tk.DISABLED)
+        self.scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        # Rows are not wrapped (one row per entry), so long messages scroll sideways
+        self.xscrollbar = ttk.Scrollbar(text_frame, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=self.xscrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.xscrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.text.tag_configure('WARNING', foreground='#b36b00')
+        self.text.tag_configure('ERROR', foreground='#c00000')
+
+        self.text.bind('<MouseWheel>', self.on_mousewheel)
+        self.text.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.text.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.text.bind('<Configure>', self.on_resize)
+
+        self.after(self.refresh_interval, self.poll)
+
+    def update_program_choices(self):
+        """Fill program filter with IDs seen in the log"""
+        self.program_combo['values'] = [self.all_label] + [str(pid) for pid in self.store.program_ids()]
+
+    def current_filters(self):
+        """Get (program_id, level, text) from filter widgets"""
+        program = self.program_filter.get().strip()
+        program_id = int(program) if program.isdigit() else None
+        level = self.level_filter.get()
+        level = level if level in LEVELS else None
+        text = self.search_text.get() or None
+        return program_id, level, text
+
+    def on_filter_change(self, *args):
+        """Re-run query on next refresh"""
+        self.filters_changed = True
+        self.follow = True
+
+    def poll(self):
+        """Refresh periodically, only when new entries arrived or filters changed"""
+        if self.filters_changed or self.store.next_seq != self.seen_seq:
+            self.refresh()
+        self.after(self.refresh_interval, self.poll)
+
+    def refresh(self):
+        """Update matches and render visible window"""
+        self.seen_seq = self.store.next_seq
+        self.filters_changed = False
+        self.matches = self.store.query(*self.current_filters())
+        self.clamp_top()
+        self.render()
+
+    def clamp_top(self):
+        """Keep visible window inside matches"""
+        max_top = max(0, len(self.matches) - self.rows)
+        if self.follow:
+            self.top = max_top
+        else:
+            self.top = min(max(0, self.top), max_top)
+
+    def render(self):
+        """Render visible rows into the text widget"""
+        visible = self.matches[self.top:self.top + self.rows]
+        key = (tuple(visible), self.rows)
+        if key != self.rendered:
+            self.rendered = key
+            self.text.configure(state=tk.NORMAL)
+            self.text.delete('1.0', tk.END)
+            for i, seq in enumerate(visible):
+                entry = self.store.get(seq)
+                self.text.insert(tk.END, ('\n' if i else '') + self.store.format(entry), entry[2])
+            self.text.configure(state=tk.DISABLED)
+
+        total = len(self.matches)
+        if total <= self.rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.top / total, (self.top + self.rows) / total)
+
+    def scroll_to(self, top):
+        """Scroll to match index"""
+        self.top = top
+        self.follow = top >= len(self.matches) - self.rows
+        self.clamp_top()
+        self.render()
+
+    def scroll_by(self, lines):
+        """Scroll by number of lines"""
+        self.scroll_to(self.top + lines)
+
+    def on_scrollbar(self, action, value, unit=None):
+        """Handle scrollbar commands (moveto / scroll)"""
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self.matches)))
+        elif action == 'scroll':
+            step = self.rows if unit == 'pages' else 1
+            self.scroll_by(int(value) * step)
+
+    def on_mousewheel(self, event):
+        """Scroll with mouse wheel"""
+        self.scroll_by(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def on_resize(self, event):
+        """Adapt number of rendered rows to widget height"""
+        line_height = max(1, self.text.tk.call('font', 'metrics', self.text.cget('font'), '-linespace'))
+        rows = max(1, event.height // line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.clamp_top()
+            self.render()
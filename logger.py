@@ -1,44 +1,179 @@
+import re
 import time
-import tkinter as tk
+import threading
+from bisect import bisect_left
+
+from event_bus import WindowPlaced, WindowMoved, ProgramExited
+
+LEVELS = ('INFO', 'WARNING', 'ERROR')
+PROGRAM_ID_PATTERN = re.compile(r'\bCG (\d+)\b')
+
+class LogStore:
+    """Fixed-capacity ring of log entries with per-program and per-level indexes"""
+    def __init__(self, max_entries=200000):
+        self.max_entries = max_entries
+        self.entries = [None] * max_entries  # entry for seq n lives at n % max_entries
+        self.next_seq = 0
+        self.by_program = {}  # {program_id: [seq, ...]}
+        self.by_level = {level: [] for level in LEVELS}
+        self.lock = threading.Lock()
+        self.query_cache = None  # (filters, scanned_up_to, [seq, ...])
+
+    def append(self, timestamp, level, program_id, text):
+        """Add entry, evicting the oldest one when full"""
+        with self.lock:
+            seq = self.next_seq
+            self.entries[seq % self.max_entries] = (seq, timestamp, level, program_id, text, text.lower())
+            self.next_seq += 1
+            self.by_level.setdefault(level, []).append(seq)
+            if program_id is not None:
+                self.by_program.setdefault(program_id, []).append(seq)
+            # Trim index lists occasionally so they stay bounded as well
+            if seq % self.max_entries == 0 and seq:
+                self._prune_indexes()
+            return seq
+
+    def _prune_indexes(self):
+        """Drop evicted sequence numbers from indexes"""
+        first = self.first_seq()
+        for index in (self.by_level, self.by_program):
+            for key in list(index):
+                seqs = index[key]
+                cut = bisect_left(seqs, first)
+                if cut:
+                    del seqs[:cut]
+                if not seqs and index is self.by_program:
+                    del index[key]
+
+    def first_seq(self):
+        """Oldest sequence number still stored"""
+        return max(0, self.next_seq - self.max_entries)
+
+    def __len__(self):
+        return self.next_seq - self.first_seq()
+
+    def get(self, seq):
+        """Get entry tuple by sequence number"""
+        return self.entries[seq % self.max_entries]
+
+    def format(self, entry):
+        """Format entry as log line"""
+        return f"{entry[1]} - {entry[4]}"
+
+    def query(self, program_id=None, level=None, text=None):
+        """Get sequence numbers of entries matching all given filters"""
+        with self.lock:
+            first = self.first_seq()
+            end = self.next_seq
+            needle = text.lower() if text else None
+            filters = (program_id, level, needle)
+
+            # Extend previous result incrementally when filters did not change
+            if self.query_cache and self.query_cache[0] == filters:
+                _, start, result = self.query_cache
+                cut = bisect_left(result, first)
+                if cut:
+                    del result[:cut]
+            else:
+                start, result = first, []
+
+            if program_id is not None:
+                candidates = self.by_program.get(program_id, [])
+            elif level is not None:
+                candidates = self.by_level.get(level, [])
+            else:
+                candidates = None
+
+            if candidates is None:
+                seqs = range(max(start, first), end)
+            else:
+                seqs = candidates[bisect_left(candidates, max(start, first)):]
+
+            entries = self.entries
+            size = self.max_entries
+            for seq in seqs:
+                entry = entries[seq % size]
+                if level is not None and entry[2] != level:
+                    continue
+                if needle is not None and needle not in entry[5]:
+                    continue
+                result.append(seq)
+
+            self.query_cache = (filters, end, result)
+            return result
+
+    def program_ids(self):
+        """Program IDs that have log entries"""
+        with self.lock:
+            return sorted(self.by_program)
+
+    def clear(self):
+        """Remove all entries"""
+        with self.lock:
+            self.entries = [None] * self.max_entries
+            self.next_seq = 0
+            self.by_program = {}
+            self.by_level = {level: [] for level in LEVELS}
+            self.query_cache = None
 
 class Logger:
-    def __init__(self, log_text_widget=None):
-        self.log_text = log_text_widget
-        self.messages = []
-        self.max_messages = 1000  # Keep last 1000 messages
-    
-    def set_log_widget(self, log_text_widget):
-        """Set the log text widget"""
-        self.log_text = log_text_widget
-    
-    def log(self, message):
+    def __init__(self, max_entries=200000, echo=True):
+        self.store = LogStore(max_entries)
+        self.echo = echo  # Also print to console
+
+    def classify(self, message):
+        """Infer severity from message prefix"""
+        if message.startswith('❌'):
+            return 'ERROR'
+        if message.startswith('⚠️'):
+            return 'WARNING'
+        return 'INFO'
+
+    def log(self, message, level=None, program_id=None):
         """Add log message"""
         timestamp = time.strftime('%H:%M:%S')
-        log_entry = f"{timestamp} - {message}"
+        if level is None:
+            level = self.classify(message)
+        if program_id is None:
+            match = PROGRAM_ID_PATTERN.search(message)
+            if match:
+                program_id = int(match.group(1))
+
+        # Store message (the log view picks it up on its next refresh)
+        self.store.append(timestamp, level, program_id, message)
+
+        # Also print to console for debugging
+        if self.echo:
+            print(f"{timestamp} - {message}")
+
+    def subscribe_events(self, event_bus, config_manager):
+        """Log CG lifecycle events published on the event bus"""
+        def on_placed(event):
+            self.log(config_manager.get_message('position_adjust_success', id=event.program_id, pid=event.pid))
         
-        # Store message
-        self.messages.append(log_entry)
-        if len(self.messages) > self.max_messages:
-            self.messages.pop(0)
+        def on_moved(event):
+            if event.source == 'drift':
+                self.log(config_manager.get_message('placement.window_restored', id=event.program_id,
+                                                    position=config_manager.get_position_name(tuple(event.position))))
+            else:
+                self.log(config_manager.get_message('position_adjust_manual_success', id=event.program_id))
         
-        # Update UI if available
-        if self.log_text:
-            def update_log():
-                self.log_text.insert(tk.END, log_entry + "\n")
-                self.log_text.see(tk.END)
-            self.log_text.after(0, update_log)
+        def on_exited(event):
+            if event.reason == 'closed':
+                self.log(config_manager.get_message('program_closed', id=event.program_id))
         
-        # Also print to console for debugging
-        print(log_entry)
+        event_bus.subscribe(WindowPlaced, on_placed)
+        event_bus.subscribe(WindowMoved, on_moved)
+        event_bus.subscribe(ProgramExited, on_exited)
+        # Windowed builds have no console, so handler errors go to the log
+        event_bus.error_handler = lambda error: self.log(config_manager.get_message('errors.event_handler_error', error=str(error)))
     
     def get_messages(self):
         """Get all stored messages"""
-        return self.messages.copy()
-    
+        with self.store.lock:
+            seqs = range(self.store.first_seq(), self.store.next_seq)
+            return [self.store.format(self.store.get(seq)) for seq in seqs]
+
     def clear_messages(self):
         """Clear all messages"""
-        self.messages.clear()
-        if self.log_text:
-            def clear_log():
-                self.log_text.delete(1.0, tk.END)
-            self.log_text.after(0, clear_log) 
\ No newline at end of file
+        self.store.clear()
@@ -0,0 +1,186 @@
+"""
+Memory diagnostics for long launcher sessions.
+
+Run the soak test from the command line:
+    python memory_diagnostics.py --soak 2000
+"""
+
+import os
+import gc
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from collections import deque
+
+import psutil
+
+class MemoryDiagnostics:
+    def __init__(self, config_manager, logger, program_manager):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.program_manager = program_manager
+        settings = config_manager.config.get('diagnostics', {})
+        self.sample_interval = settings.get('rss_sample_interval', 60)
+        self.top_count = settings.get('top_allocators', 10)
+        self.frames = settings.get('traceback_frames', 1)
+        self.rss_samples = deque(maxlen=settings.get('rss_samples', 1440))  # [(timestamp, rss_bytes)]
+        self.baseline = None  # Snapshot of the report that armed tracing
+        self.started_tracing = False
+        self.sampler_thread = None
+        self.process = psutil.Process()
+
+    def start_rss_sampling(self):
+        """Record RSS periodically in a bounded history"""
+        if self.sampler_thread is not None:
+            return
+        def sample():
+            while True:
+                self.sample_rss()
+                time.sleep(self.sample_interval)
+        self.sampler_thread = threading.Thread(target=sample, daemon=True)
+        self.sampler_thread.start()
+
+    def sample_rss(self):
+        """Take one RSS sample"""
+        rss = self.process.memory_info().rss
+        self.rss_samples.append((time.time(), rss))
+        return rss
+
+    def get_object_counts(self):
+        """Sizes of the structures each manager keeps for the session"""
+        pm = self.program_manager
+        store = self.logger.store
+        return {
+            'programs': len(pm.programs),
+            'batch_files': len(pm.batch_files),
+            'log_entries': len(store),
+            'log_index_entries': sum(len(v) for v in store.by_level.values()) + sum(len(v) for v in store.by_program.values()),
+            'registry_claims': len(pm.pid_registry.claims),
+            'captured_processes': len(pm.output_capture.processes),
+            'probe_cache': len(pm.server_probe.results),
+            'launch_plans': len(pm.profile_manager.plans),
+            'pending_events': sum(len(entry[2]) for entry in pm.event_bus.batched),
+            'threads': threading.active_count(),
+        }
+
+    def report(self):
+        """Build memory report lines: top allocators, object counts and RSS trend"""
+        lines = [self.config_manager.get_message('diagnostics.report_header')]
+
+        if self.baseline is None:
+            # Tracing is only on between two reports: the next one shows what was allocated in between
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self.started_tracing = True
+            self.baseline = self.take_snapshot()
+            lines.append(self.config_manager.get_message('diagnostics.tracing_started'))
+        else:
+            snapshot = self.take_snapshot()
+            for stat in snapshot.compare_to(self.baseline, 'lineno')[:self.top_count]:
+                frame = stat.traceback[0]
+                lines.append(f"  {frame.filename}:{frame.lineno}  {stat.size / 1024:.1f} KB ({stat.size_diff / 1024:+.1f} KB), {stat.count} blocks")
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append(self.config_manager.get_message('diagnostics.traced', current=f"{current / 1024 / 1024:.1f}", peak=f"{peak / 1024 / 1024:.1f}"))
+            self.baseline = None
+            if self.started_tracing:
+                tracemalloc.stop()
+                self.started_tracing = False
+            lines.append(self.config_manager.get_message('diagnostics.tracing_stopped'))
+
+        counts = ', '.join(f"{name}={count}" for name, count in self.get_object_counts().items())
+        lines.append(self.config_manager.get_message('diagnostics.object_counts', counts=counts))
+
+        rss = self.sample_rss()
+        first_rss = self.rss_samples[0][1]
+        lines.append(self.config_manager.get_message('diagnostics.rss', current=f"{rss / 1024 / 1024:.1f}",
+                                                     change=f"{(rss - first_rss) / 1024 / 1024:+.1f}",
+                                                     samples=len(self.rss_samples)))
+        return lines
+
+    def take_snapshot(self):
+        """Traced allocations, without tracemalloc's and the import system's own"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+
+    def log_report(self):
+        """Write memory report to the log"""
+        for line in self.report():
+            self.logger.log(line)
+
+def run_soak_test(iterations=2000, warmup=200, tolerance_kb=512):
+    """Launch and kill fake clients repeatedly and check that traced memory stays flat"""
+    work_dir = tempfile.mkdtemp(prefix='cgmsv_soak_')
+    try:
+        return _soak(work_dir, iterations, warmup, tolerance_kb)
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def _soak(work_dir, iterations, warmup, tolerance_kb):
+    """Soak test body, writing capture logs and the PID registry under work_dir"""
+    from config_manager import ConfigManager
+    from logger import Logger
+    from event_bus import EventBus, PROGRAM_EVENTS
+    from program_manager import ProgramManager
+
+    config_manager = ConfigManager()
+    config = config_manager.config
+    config['capture'] = dict(config.get('capture', {}), enabled=True, log_dir=os.path.join(work_dir, 'logs'), max_bytes=4096, backup_count=0)
+    config['pid_registry'] = {'file': os.path.join(work_dir, 'pids.json')}
+    config['integrity'] = {'verify_before_launch': False}
+    config['monitoring'] = dict(config['monitoring'], max_position_attempts=0)
+
+    logger = Logger(max_entries=1000, echo=False)
+    event_bus = EventBus()
+    logger.subscribe_events(event_bus, config_manager)
+    program_manager = ProgramManager(config_manager, logger, event_bus)
+    # Stand-in for the UI's coalesced list refresh
+    event_bus.subscribe_batched(PROGRAM_EVENTS, lambda events: None)
+
+    fake_client = sys.executable
+    fake_params = '-S -c "import time; time.sleep(60)"'
+    process = psutil.Process()
+
+    tracemalloc.start()
+    baseline = None
+    start_rss = None
+    started = time.perf_counter()
+    for i in range(iterations):
+        program_id = program_manager.run_program(fake_client, fake_params, config['defaults']['position'])
+        if program_id is None:
+            print(f"Launch failed at iteration {i}")
+            return False
+        program_manager.terminate_program(program_id)
+        if i + 1 == warmup:
+            time.sleep(0.5)
+            gc.collect()
+            baseline = tracemalloc.get_traced_memory()[0]
+            start_rss = process.memory_info().rss
+        if (i + 1) % 500 == 0:
+            print(f"{i + 1}/{iterations} clients, traced {tracemalloc.get_traced_memory()[0] / 1024:.0f} KB")
+
+    # Let capture readers and placement threads of the last clients finish
+    time.sleep(3)
+    gc.collect()
+    final = tracemalloc.get_traced_memory()[0]
+    growth_kb = (final - baseline) / 1024
+    rss_growth_mb = (process.memory_info().rss - start_rss) / 1024 / 1024
+    print(f"Soak: {iterations} clients in {time.perf_counter() - started:.1f}s, traced growth {growth_kb:+.1f} KB, "
+          f"RSS growth {rss_growth_mb:+.1f} MB, threads {threading.active_count()}")
+    ok = growth_kb <= tolerance_kb
+    print("✅ Memory stayed flat" if ok else f"❌ Traced memory grew more than {tolerance_kb} KB")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CGMSV Launcher memory soak test")
+    parser.add_argument("--soak", type=int, default=2000, help="number of fake clients to launch and kill")
+    parser.add_argument("--warmup", type=int, default=200, help="iterations before the memory baseline is taken")
+    parser.add_argument("--tolerance-kb", type=int, default=512, help="allowed traced memory growth")
+    args = parser.parse_args()
+    sys.exit(0 if run_soak_test(args.soak, args.warmup, args.tolerance_kb) else 1)
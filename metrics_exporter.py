@@ -0,0 +1,250 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+from event_bus import ProgramLaunched, WindowPlaced, WindowMoved, ProgramExited, SweepCompleted
+
+def format_labels(names, values):
+    """Prometheus label set, e.g. {program_id="3"}"""
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+class Metric:
+    """Counter or gauge with optional labels, updated in place"""
+    def __init__(self, name, kind, help_text, label_names=()):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {} if label_names else {(): 0}  # {label_values: value}
+
+    def inc(self, amount=1, *labels):
+        """Add to value of a label set"""
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set(self, value, *labels):
+        """Set value of a label set"""
+        self.values[labels] = value
+
+    def remove(self, *labels):
+        """Drop a label set (e.g. of a CG that exited)"""
+        self.values.pop(labels, None)
+
+    def render(self):
+        """Prometheus text lines"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{format_labels(self.label_names, labels)} {value}")
+        return lines
+
+    def to_json(self):
+        """JSON-ready values"""
+        return [{'labels': dict(zip(self.label_names, labels)), 'value': value} for labels, value in self.values.items()]
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = sorted(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Count value in its bucket"""
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def render(self):
+        """Prometheus text lines"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+    def to_json(self):
+        """JSON-ready values"""
+        return {'buckets': dict(zip(self.buckets, self.counts)), 'sum': self.sum, 'count': self.count}
+
+class MetricsExporter:
+    """Fleet metrics kept up to date from events and served on localhost"""
+    def __init__(self, config_manager, logger, program_manager):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.program_manager = program_manager
+        self.settings = config_manager.config.get('metrics', {})
+        self.sample_interval = self.settings.get('sample_interval', 5)
+        self.lock = threading.Lock()
+        self.processes = {}  # {program_id: psutil.Process} - kept so cpu_percent measures between samples
+        self.server = None
+        self.sampler_thread = None
+
+        self.clients_running = Metric('cgmsv_clients_running', 'gauge', 'CGs currently tracked by the launcher')
+        self.launches = Metric('cgmsv_launches_total', 'counter', 'CG launches')
+        self.restarts = Metric('cgmsv_restarts_total', 'counter', 'Automatic CG restarts')
+        self.exits = Metric('cgmsv_exits_total', 'counter', 'CGs that closed or were terminated', ('reason',))
+        self.window_moves = Metric('cgmsv_window_moves_total', 'counter', 'Windows moved after placement', ('source',))
+        self.sweep_duration = Metric('cgmsv_monitor_sweep_seconds', 'gauge', 'Duration of the last monitor sweep', ('shard',))
+        self.sweeps = Metric('cgmsv_monitor_sweeps_total', 'counter', 'Monitor sweeps')
+        self.client_cpu = Metric('cgmsv_client_cpu_percent', 'gauge', 'CPU use per CG', ('program_id',))
+        self.client_rss = Metric('cgmsv_client_rss_bytes', 'gauge', 'Resident memory per CG', ('program_id',))
+        self.placement_latency = Histogram('cgmsv_placement_latency_seconds', 'Time from launch to window placement',
+                                           self.settings.get('latency_buckets', [1, 2, 5, 10, 20, 30, 60]))
+        self.sweep_histogram = Histogram('cgmsv_monitor_sweep_duration_seconds', 'Monitor sweep durations',
+                                         self.settings.get('sweep_buckets', [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1]))
+        self.metrics = [self.clients_running, self.launches, self.restarts, self.exits, self.window_moves,
+                        self.sweep_duration, self.sweeps, self.placement_latency, self.sweep_histogram,
+                        self.client_cpu, self.client_rss]
+
+        self.clients_running.set(len(program_manager.get_programs()))
+        event_bus = program_manager.event_bus
+        event_bus.subscribe(ProgramLaunched, self.on_launched)
+        event_bus.subscribe(ProgramExited, self.on_exited)
+        event_bus.subscribe(WindowPlaced, self.on_placed)
+        event_bus.subscribe(WindowMoved, self.on_moved)
+        event_bus.subscribe(SweepCompleted, self.on_sweep)
+
+    def is_enabled(self):
+        """Check if the metrics endpoint is enabled"""
+        return self.settings.get('enabled', False)
+
+    def on_launched(self, event):
+        """Count launch (and restart)"""
+        with self.lock:
+            self.clients_running.inc()
+            self.launches.inc()
+            if event.restart:
+                self.restarts.inc()
+
+    def on_exited(self, event):
+        """Count exit and drop the CG's per-client series"""
+        with self.lock:
+            self.clients_running.inc(-1)
+            self.exits.inc(1, event.reason)
+            self.client_cpu.remove(event.program_id)
+            self.client_rss.remove(event.program_id)
+            self.processes.pop(event.program_id, None)
+
+    def on_placed(self, event):
+        """Record placement latency"""
+        with self.lock:
+            self.placement_latency.observe(event.latency)
+
+    def on_moved(self, event):
+        """Count window move by source"""
+        with self.lock:
+            self.window_moves.inc(1, event.source)
+
+    def on_sweep(self, event):
+        """Record monitor sweep duration"""
+        with self.lock:
+            self.sweeps.inc()
+            self.sweep_duration.set(round(event.duration, 6), event.shard)
+            self.sweep_histogram.observe(event.duration)
+
+    def sample_clients(self):
+        """Update per-CG CPU and RSS gauges"""
+        for program_id, info in list(self.program_manager.get_programs().items()):
+            pid = info.get('pid')
+            if not pid:
+                continue
+            process = self.processes.get(program_id)
+            try:
+                if process is None or process.pid != pid:
+                    process = psutil.Process(pid)
+                    process.cpu_percent()  # First call only sets the baseline
+                    with self.lock:
+                        # on_exited may have run since get_programs(); it removes entries under this lock
+                        if program_id in self.program_manager.get_programs():
+                            self.processes[program_id] = process
+                    continue
+                with process.oneshot():
+                    cpu = process.cpu_percent()
+                    rss = process.memory_info().rss
+            except psutil.Error:
+                continue
+            with self.lock:
+                if program_id in self.processes:
+                    self.client_cpu.set(cpu, program_id)
+                    self.client_rss.set(rss, program_id)
+
+    def render_text(self):
+        """Prometheus text exposition of all metrics"""
+        with self.lock:
+            lines = []
+            for metric in self.metrics:
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def render_json(self):
+        """All metrics as JSON"""
+        with self.lock:
+            data = {metric.name: metric.to_json() for metric in self.metrics}
+        return json.dumps(data)
+
+    def start(self):
+        """Start client sampling and the HTTP endpoint"""
+        if not self.is_enabled() or self.server is not None:
+            return
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = exporter.render_text(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = exporter.render_json(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes would flood the launcher log
+
+        host = self.settings.get('host', '127.0.0.1')
+        port = self.settings.get('port', 9464)
+        try:
+            self.server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            self.logger.log(self.config_manager.get_message('metrics.start_failed', port=port, error=str(e)))
+            return
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        def sample():
+            while self.server is not None:
+                self.sample_clients()
+                time.sleep(self.sample_interval)
+        self.sampler_thread = threading.Thread(target=sample, daemon=True)
+        self.sampler_thread.start()
+        self.logger.log(self.config_manager.get_message('metrics.started', host=host, port=self.server.server_address[1]))
+
+    def stop(self):
+        """Stop the HTTP endpoint"""
+        if self.server is not None:
+            server, self.server = self.server, None
+            server.shutdown()
+            server.server_close()
@@ -2,19 +2,18 @@ import threading
 import time
 import psutil
 
+from placement_manager import PlacementVerifier
+from event_bus import SweepCompleted
+
 class MonitorManager:
-    def __init__(self, config_manager, program_manager, logger, ui_manager=None):
+    def __init__(self, config_manager, program_manager, logger, window_backend=None):
         self.config_manager = config_manager
         self.program_manager = program_manager
         self.logger = logger
-        self.ui_manager = ui_manager
+        self.placement_verifier = PlacementVerifier(config_manager, program_manager, logger, window_backend)
         self.monitor_thread = None
         self.is_running = False
     
-    def set_ui_manager(self, ui_manager):
-        """Set UI manager reference"""
-        self.ui_manager = ui_manager
-    
     def start_monitoring(self):
         """Start CG monitoring"""
         if self.monitor_thread is None or not self.monitor_thread.is_alive():
@@ -34,12 +33,18 @@ class MonitorManager:
         
         while self.is_running:
             try:
-                # Check status of each CG
-                for program_id, info in list(self.program_manager.get_programs().items()):
-                    if not self.program_manager.check_program_status(program_id):
-                        # CG was closed, update UI
-                        if self.ui_manager:
-                            self.ui_manager.update_program_list()
+                # Check status of each CG against one process snapshot (closed CGs publish ProgramExited)
+                sweep_started = time.perf_counter()
+                with self.program_manager.event_bus.hold():
+                    # Everything a sweep changes reaches the UI as one batch, however long it takes
+                    table = self.program_manager.process_snapshot.get()
+                    program_ids = list(self.program_manager.get_programs())
+                    for program_id in program_ids:
+                        self.program_manager.check_program_status(program_id, table)
+                    
+                    # Move windows that drifted away from their slot back
+                    self.placement_verifier.verify_if_due()
+                self.program_manager.event_bus.publish(SweepCompleted(time.perf_counter() - sweep_started, len(program_ids)))
                 
                 time.sleep(check_interval)
                 
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+
+class RotatingOutputFile:
+    """Append-only file that rolls over to .1, .2, ... when it exceeds max_bytes"""
+    def __init__(self, path, max_bytes, backup_count):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.file = open(path, 'ab')
+        self.size = self.file.tell()
+
+    def write(self, data):
+        """Write chunk, rotating first if it would overflow"""
+        if self.max_bytes and self.size + len(data) > self.max_bytes and self.size:
+            self.rotate()
+        self.file.write(data)
+        self.file.flush()
+        self.size += len(data)
+
+    def rotate(self):
+        """Shift backups and start a new file"""
+        self.file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, 'ab')
+        self.size = 0
+
+    def close(self):
+        self.file.close()
+
+class OutputCaptureManager:
+    """Launches CGs with piped output, drained by one asyncio loop for all clients"""
+    def __init__(self, config_manager, logger, session_id):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.session_id = session_id  # Program IDs restart every session, so log names include it
+        self.settings = config_manager.config.get('capture', {})
+        self.log_dir = self.settings.get('log_dir', 'client_logs')
+        self.max_bytes = self.settings.get('max_bytes', 5 * 1024 * 1024)
+        self.backup_count = self.settings.get('backup_count', 3)
+        self.read_chunk = self.settings.get('read_chunk', 65536)
+        self.loop = None
+        self.loop_thread = None
+        self.start_lock = threading.Lock()
+        self.processes = {}  # {program_id: asyncio.subprocess.Process}
+
+    def is_enabled(self):
+        """Check if output capture mode is enabled"""
+        return self.settings.get('enabled', False)
+
+    def _ensure_loop(self):
+        """Start the shared reader loop on first use"""
+        with self.start_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+                self.loop_thread.start()
+        return self.loop
+
+    def get_log_path(self, program_id, program_name):
+        """Get output log path of a CG"""
+        return os.path.join(self.log_dir, f"cg_{self.session_id}_{program_id}_{os.path.splitext(program_name)[0]}.log")
+
+    def launch(self, program_id, argv, cwd):
+        """Start CG with captured output, returns its PID"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        future = asyncio.run_coroutine_threadsafe(self._spawn(program_id, argv, cwd), self._ensure_loop())
+        return future.result()
+
+    async def _spawn(self, program_id, argv, cwd):
+        """Create subprocess and schedule its reader"""
+        kwargs = {}
+        if sys.platform == 'win32':
+            kwargs['creationflags'] = 0x08000000  # CREATE_NO_WINDOW
+        process = await asyncio.create_subprocess_exec(
+            *argv, cwd=cwd, stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, **kwargs)
+        self.processes[program_id] = process
+        output = RotatingOutputFile(self.get_log_path(program_id, os.path.basename(argv[0])),
+                                    self.max_bytes, self.backup_count)
+        output.write(f"=== {time.strftime('%Y-%m-%d %H:%M:%S')} CG {program_id} started (PID {process.pid}) ===\n".encode('utf-8'))
+        self.loop.create_task(self._drain(program_id, process, output))
+        return process.pid
+
+    async def _drain(self, program_id, process, output):
+        """Copy output to the log file until EOF, so the client never blocks on a full pipe"""
+        try:
+            while True:
+                chunk = await process.stdout.read(self.read_chunk)
+                if not chunk:
+                    break
+                output.write(chunk)
+            returncode = await process.wait()
+            output.write(f"=== {time.strftime('%Y-%m-%d %H:%M:%S')} exited with code {returncode} ===\n".encode('utf-8'))
+            self.logger.log(self.config_manager.get_message('capture.client_exited', id=program_id, code=returncode, path=output.path))
+        except Exception as e:
+            self.logger.log(self.config_manager.get_message('capture.capture_error', id=program_id, error=str(e)))
+        finally:
+            output.close()
+            self.processes.pop(program_id, None)
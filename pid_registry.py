@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import psutil
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+class PidRegistry:
+    """Machine-wide table of CG PIDs claimed by running launcher instances"""
+    def __init__(self, config_manager, logger):
+        self.config_manager = config_manager
+        self.logger = logger
+        settings = config_manager.config.get('pid_registry', {})
+        self.path = settings.get('file') or os.path.join(tempfile.gettempdir(), 'cgmsv_launcher_pids.json')
+        self.lock_path = self.path + '.lock'
+        self.owner = self._identity(os.getpid())
+        self.thread_lock = threading.Lock()
+        self.cache_key = None
+        self.claims = {}  # {pid: [owner_pid, owner_create_time]}
+
+    def _identity(self, pid):
+        """(pid, create_time) pair, robust against PID reuse"""
+        try:
+            return [pid, psutil.Process(pid).create_time()]
+        except psutil.Error:
+            return None
+
+    def _owner_alive(self, owner):
+        """Check if the launcher that made a claim is still running"""
+        return self._identity(owner[0]) == owner
+
+    @contextmanager
+    def _locked(self):
+        """Hold the cross-process registry lock"""
+        with self.thread_lock:
+            with open(self.lock_path, 'a+b') as lock_file:
+                if sys.platform == 'win32':
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                else:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if sys.platform == 'win32':
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                    else:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load(self):
+        """Load claims, reusing the parsed table while the file is unchanged (caller holds the lock)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.cache_key = None
+            self.claims = {}
+            return self.claims
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key != self.cache_key:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.claims = {int(pid): owner for pid, owner in json.load(f).items()}
+            except (OSError, ValueError):
+                self.claims = {}
+            self.cache_key = key
+        return self.claims
+
+    def _save(self, claims):
+        """Write claims atomically (caller holds the lock)"""
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({str(pid): owner for pid, owner in claims.items()}, f)
+        os.replace(temp_path, self.path)
+        self.claims = claims
+        self.cache_key = None
+
+    def _drop_stale(self, claims):
+        """Remove claims of dead launchers and of exited CGs"""
+        alive_owners = {}
+        fresh = {}
+        for pid, owner in claims.items():
+            owner_key = tuple(owner)
+            if owner_key not in alive_owners:
+                alive_owners[owner_key] = self._owner_alive(owner)
+            if alive_owners[owner_key] and psutil.pid_exists(pid):
+                fresh[pid] = owner
+        return fresh
+
+    def claim(self, pid):
+        """Claim PID for this launcher, returns False if another live launcher owns it"""
+        with self._locked():
+            claims = self._drop_stale(dict(self._load()))
+            owner = claims.get(pid)
+            if owner is not None and owner != self.owner:
+                self._save(claims)
+                return False
+            claims[pid] = self.owner
+            self._save(claims)
+            return True
+
+    def release(self, pid):
+        """Release PID claimed by this launcher"""
+        with self._locked():
+            claims = dict(self._load())
+            if claims.get(pid) == self.owner:
+                del claims[pid]
+                self._save(claims)
+
+    def release_all(self):
+        """Release every PID claimed by this launcher"""
+        with self._locked():
+            claims = {pid: owner for pid, owner in self._load().items() if owner != self.owner}
+            self._save(claims)
+
+    def cleanup(self):
+        """Drop claims left behind by launchers that are no longer running"""
+        with self._locked():
+            claims = self._load()
+            fresh = self._drop_stale(claims)
+            if len(fresh) != len(claims):
+                self._save(fresh)
+                self.logger.log(self.config_manager.get_message('registry.stale_claims_removed', count=len(claims) - len(fresh)))
+
+    def foreign_pids(self):
+        """Set of PIDs claimed by other launcher instances"""
+        # Readers hold the lock too: on Windows os.replace fails while another process has the file open
+        with self._locked():
+            return {pid for pid, owner in self._load().items() if owner != self.owner}
@@ -0,0 +1,133 @@
+import sys
+import time
+from abc import ABC, abstractmethod
+
+from event_bus import WindowMoved
+
+SWP_NOZORDER = 0x0004
+SWP_NOACTIVATE = 0x0010
+GW_OWNER = 4
+
+class WindowBackend(ABC):
+    """Window system access used for placement checks (replaceable for testing)"""
+    @abstractmethod
+    def get_window_rects(self, pids):
+        """Get {pid: (hwnd, (x, y, width, height))} of the main window of each given PID"""
+
+    @abstractmethod
+    def set_window_pos(self, hwnd, x, y, width, height):
+        """Move and resize window, returns True on success"""
+
+    @abstractmethod
+    def get_foreground_pid(self):
+        """Get PID owning the foreground window (None if unknown)"""
+
+class Win32WindowBackend(WindowBackend):
+    """WindowBackend using user32 through ctypes"""
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        self.wintypes = wintypes
+        self.user32 = ctypes.WinDLL('user32', use_last_error=True)
+        self.enum_proc_type = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        self.user32.GetWindow.restype = wintypes.HWND
+        self.user32.GetForegroundWindow.restype = wintypes.HWND
+        self.user32.SetWindowPos.argtypes = [wintypes.HWND, wintypes.HWND, ctypes.c_int, ctypes.c_int,
+                                             ctypes.c_int, ctypes.c_int, wintypes.UINT]
+
+    def get_window_rects(self, pids):
+        """Read all requested window rectangles in a single EnumWindows pass"""
+        wanted = set(pids)
+        found = {}
+        user32 = self.user32
+        pid_out = self.wintypes.DWORD()
+        rect = self.wintypes.RECT()
+
+        def callback(hwnd, lparam):
+            if not user32.IsWindowVisible(hwnd) or user32.GetWindow(hwnd, GW_OWNER):
+                return True
+            user32.GetWindowThreadProcessId(hwnd, self.ctypes.byref(pid_out))
+            pid = pid_out.value
+            if pid in wanted and pid not in found:
+                # Minimized windows report a bogus rectangle, leave them alone
+                if not user32.IsIconic(hwnd) and user32.GetWindowRect(hwnd, self.ctypes.byref(rect)):
+                    found[pid] = (hwnd, (rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top))
+                if len(found) == len(wanted):
+                    return False
+            return True
+
+        user32.EnumWindows(self.enum_proc_type(callback), 0)
+        return found
+
+    def set_window_pos(self, hwnd, x, y, width, height):
+        """Move and resize window without changing Z order or focus"""
+        return bool(self.user32.SetWindowPos(hwnd, None, x, y, width, height, SWP_NOZORDER | SWP_NOACTIVATE))
+
+    def get_foreground_pid(self):
+        """Get PID owning the foreground window"""
+        hwnd = self.user32.GetForegroundWindow()
+        if not hwnd:
+            return None
+        pid = self.wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(hwnd, self.ctypes.byref(pid))
+        return pid.value or None
+
+def get_default_backend():
+    """Get window backend for current platform (None if unsupported)"""
+    if sys.platform == 'win32':
+        return Win32WindowBackend()
+    return None
+
+class PlacementVerifier:
+    """Detects windows that left their slot and moves only those back"""
+    def __init__(self, config_manager, program_manager, logger, backend=None):
+        self.config_manager = config_manager
+        self.program_manager = program_manager
+        self.logger = logger
+        self.backend = backend if backend is not None else get_default_backend()
+        monitoring = config_manager.config['monitoring']
+        self.tolerance = monitoring.get('drift_tolerance', 2)
+        self.interval = monitoring.get('drift_check_interval', monitoring['check_interval'])
+        self.last_check = 0
+
+    def get_expected_rect(self, info):
+        """Expected (x, y, width, height) of a CG window"""
+        width, height = self.config_manager.config['defaults'].get('window_size', [640, 480])
+        x, y = info['position']
+        return (x, y, width, height)
+
+    def is_drifted(self, actual, expected):
+        """Check if rectangle differs from expected beyond tolerance"""
+        return any(abs(a - e) > self.tolerance for a, e in zip(actual, expected))
+
+    def verify_if_due(self):
+        """Run verification when drift_check_interval has elapsed"""
+        now = time.monotonic()
+        if now - self.last_check < self.interval:
+            return []
+        self.last_check = now
+        return self.verify()
+
+    def verify(self):
+        """Check all placed windows in one batch, returns list of re-placed program IDs"""
+        if self.backend is None:
+            return []
+        expected = {}
+        for program_id, info in list(self.program_manager.get_programs().items()):
+            if info.get('pid'):
+                expected[info['pid']] = (program_id, self.get_expected_rect(info))
+        if not expected:
+            return []
+
+        replaced = []
+        for pid, (hwnd, actual) in self.backend.get_window_rects(expected.keys()).items():
+            program_id, rect = expected[pid]
+            if not self.is_drifted(actual, rect):
+                continue
+            if self.backend.set_window_pos(hwnd, *rect):
+                replaced.append(program_id)
+                self.program_manager.event_bus.publish(WindowMoved(program_id, rect[:2], 'drift'))
+            else:
+                self.logger.log(self.config_manager.get_message('placement.restore_failed', id=program_id))
+        return replaced
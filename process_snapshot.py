@@ -0,0 +1,73 @@
+import time
+import threading
+from array import array
+
+import psutil
+
+class ProcessTable:
+    """Columnar snapshot of the OS process table"""
+    def __init__(self, taken_at):
+        self.taken_at = taken_at
+        self.pids = array('q')
+        self.create_times = array('d')
+        self.names = []  # Lower-case process names
+        self.rows = {}  # {pid: row}
+        self.rows_by_name = {}  # {name: [row, ...]}
+
+    def add(self, pid, create_time, name):
+        """Append a process row"""
+        row = len(self.pids)
+        name = (name or '').lower()
+        self.pids.append(pid)
+        self.create_times.append(create_time or 0.0)
+        self.names.append(name)
+        self.rows[pid] = row
+        self.rows_by_name.setdefault(name, []).append(row)
+
+    def __len__(self):
+        return len(self.pids)
+
+    def is_alive(self, pid, create_time=None):
+        """Check if PID is running and, when given, is the same process (not a reused PID)"""
+        row = self.rows.get(pid)
+        if row is None:
+            return False
+        return create_time is None or abs(self.create_times[row] - create_time) < 0.01
+
+    def pids_by_name(self, name):
+        """Get PIDs of processes with the given executable name (case-insensitive)"""
+        return [self.pids[row] for row in self.rows_by_name.get(name.lower(), ())]
+
+class ProcessSnapshotService:
+    """Enumerates processes at most once per max_age seconds and shares the result"""
+    def __init__(self, max_age=1.0):
+        self.max_age = max_age
+        self.table = None
+        self.lock = threading.Lock()
+
+    def get(self, max_age=None):
+        """Get a snapshot no older than max_age (defaults to the configured staleness)"""
+        if max_age is None:
+            max_age = self.max_age
+        table = self.table
+        if table is not None and time.monotonic() - table.taken_at <= max_age:
+            return table
+        with self.lock:
+            # Another thread may have refreshed while we waited
+            table = self.table
+            if table is None or time.monotonic() - table.taken_at > max_age:
+                table = self.scan()
+                self.table = table
+            return table
+
+    def invalidate(self):
+        """Force next get() to rescan (used after terminating a CG, so its PID is not matched by name again)"""
+        self.table = None
+
+    def scan(self):
+        """Enumerate the process table once"""
+        table = ProcessTable(time.monotonic())
+        for proc in psutil.process_iter(['pid', 'create_time', 'name']):
+            info = proc.info
+            table.add(info['pid'], info['create_time'], info['name'])
+        return table
@@ -3,79 +3,113 @@ import subprocess
 import threading
 import time
 import psutil
-import tempfile
+
+from integrity_manager import IntegrityManager
+from server_probe import ServerProbe
+from pid_registry import PidRegistry
+from output_capture import OutputCaptureManager
+from event_bus import EventBus, ProgramLaunched, PidResolved, WindowPlaced, WindowMoved, ProgramExited
+from launch_profiles import ProfileManager, compile_plan
+from process_snapshot import ProcessSnapshotService
+from launch_journal import LaunchJournal
 
 class ProgramManager:
-    def __init__(self, config_manager, logger):
+    def __init__(self, config_manager, logger, event_bus=None):
         self.config_manager = config_manager
         self.logger = logger
+        self.event_bus = event_bus if event_bus is not None else EventBus()
         self.programs = {}  # {program_id: {'path': path, 'name': name, 'process': process, 'position': (x,y), 'status': status}}
         self.next_program_id = 1
+        self.program_id_step = 1  # Shard workers interleave IDs so they stay unique across processes
         self.batch_files = {}  # {program_id: batch_file_path} - Track batch file paths
+        self.launch_journal = LaunchJournal(config_manager, logger)
+        self.integrity_manager = IntegrityManager(config_manager, logger)
+        self.server_probe = ServerProbe(config_manager, logger)
+        self.pid_registry = PidRegistry(config_manager, logger)
+        self.pid_registry.cleanup()
+        self.output_capture = OutputCaptureManager(config_manager, logger, self.launch_journal.session_id)
+        self.profile_manager = ProfileManager(config_manager, logger)
+        self.process_snapshot = ProcessSnapshotService(config_manager.config['monitoring'].get('snapshot_max_age', 1.0))
     
     def run_program(self, program_path, params, position_name):
-        """Run CG program using hidden batch file"""
+        """Run CG program from free-form path and parameters"""
         if not os.path.exists(program_path):
             self.logger.log(self.config_manager.get_message('errors.program_not_found', path=program_path))
             return None
+        plan = compile_plan(self.config_manager, os.path.basename(program_path), program_path, params, position_name)
+        return self.launch_plan(plan)
+    
+    def run_profile(self, name):
+        """Run CG from a named profile in config.yml"""
+        plan = self.profile_manager.get_plan(name)
+        if plan is None:
+            self.logger.log(self.config_manager.get_message('profiles.profile_not_found', name=name))
+            return None
+        return self.launch_plan(plan)
+    
+    def run_fleet(self, names=None):
+        """Run several profiles (all by default), probing their servers once up front"""
+        return [self.launch_plan(plan, probe=False) for plan in self.get_fleet_plans(names)]
+    
+    def get_fleet_plans(self, names=None):
+        """Plans of the selected profiles, empty if their servers failed the probe"""
+        plans = self.profile_manager.get_plans()
+        selected = [plans[name] for name in (names if names is not None else plans) if name in plans]
+        if self.server_probe.is_enabled() and not self.server_probe.check_params([plan.params for plan in selected]):
+            return []
+        return selected
+    
+    def launch_plan(self, plan, probe=True, restarts=0, is_restart=False):
+        """Run CG from a precompiled LaunchPlan"""
+        # Verify client files against the integrity manifest
+        if self.integrity_manager.is_enabled() and not self.integrity_manager.check_before_launch(plan.path):
+            return None
         
-        x, y = self.config_manager.get_position_coords(position_name)
+        # Check that the login server is reachable
+        if probe and self.server_probe.is_enabled() and not self.server_probe.check_params([plan.params]):
+            return None
         
         program_id = self.next_program_id
-        self.next_program_id += 1
+        self.next_program_id += self.program_id_step
         
         self.logger.log(self.config_manager.get_message('program_execution_start', id=program_id))
-        self.logger.log(self.config_manager.get_message('program_name', name=os.path.basename(program_path)))
-        self.logger.log(self.config_manager.get_message('position_set', position=self.config_manager.get_position_name((x, y))))
+        self.logger.log(self.config_manager.get_message('program_name', name=plan.program_name))
+        self.logger.log(self.config_manager.get_message('position_set', position=plan.position_label))
         
         try:
-            program_dir = os.path.dirname(program_path)
-            program_name = os.path.basename(program_path)
-            process_name = os.path.splitext(program_name)[0]
-            
-            # Create completely hidden batch file
-            batch_content = f"""@echo off
-cd /d "{program_dir}"
-start "" "{program_name}" {params}
-"""
-            
-            # Create hidden batch file in temp directory
-            temp_dir = tempfile.gettempdir()
-            temp_bat = os.path.join(temp_dir, f"temp_program_{program_id}.bat")
-            
-            with open(temp_bat, "w", encoding="cp949") as f:
-                f.write(batch_content)
-            
-            # Set batch file as hidden
-            try:
-                import win32file
-                win32file.SetFileAttributes(temp_bat, win32file.FILE_ATTRIBUTE_HIDDEN)
-            except ImportError:
-                pass
-            
-            # Execute batch file completely hidden
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            # Use cmd /c to execute batch file in hidden state
-            process = subprocess.Popen(['cmd', '/c', temp_bat], 
-                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                                     startupinfo=startupinfo,
-                                     creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS)
-            
-            # Save batch file path
-            self.batch_files[program_id] = temp_bat
+            if self.output_capture.is_enabled():
+                # Capture mode: start CG directly with piped output, PID is known right away
+                pid = self.output_capture.launch(program_id, plan.argv, plan.program_dir)
+                try:
+                    self.pid_registry.claim(pid)
+                except Exception:
+                    # Not tracked yet, so nothing else would ever close it
+                    try:
+                        psutil.Process(pid).kill()
+                    except psutil.Error:
+                        pass
+                    raise
+            else:
+                self.launch_with_batch_file(program_id, plan.program_dir, plan.program_name, plan.params)
+                pid = None
             
             # Save CG information
             self.programs[program_id] = {
-                'path': program_path,
-                'name': program_name,
-                'process_name': process_name,
-                'position': (x, y),
+                'path': plan.path,
+                'name': plan.program_name,
+                'process_name': plan.process_name,
+                'position': plan.position,
                 'status': 'Running',
-                'pid': None
+                'pid': pid,
+                'launched_at': time.time(),
+                'plan': plan,
+                'restarts': restarts
             }
+            self.event_bus.publish(ProgramLaunched(program_id, plan.program_name, plan.position, is_restart))
+            if pid:
+                self.record_process_identity(program_id)
+                self.apply_affinity(program_id)
+                self.event_bus.publish(PidResolved(program_id, pid))
             
             # Start auto position adjustment
             self.auto_adjust_position(program_id)
@@ -84,8 +118,90 @@ start "" "{program_name}" {params}
             
         except Exception as e:
             self.logger.log(self.config_manager.get_message('errors.program_execution_error', id=program_id, error=str(e)))
+            # Do not keep the batch file of a launch that never registered
+            self.cleanup_batch_file(program_id)
             return None
     
+    def launch_with_batch_file(self, program_id, program_dir, program_name, params):
+        """Start CG through a hidden batch file (output is discarded)"""
+        # Create completely hidden batch file
+        batch_content = f"""@echo off
+cd /d "{program_dir}"
+start "" "{program_name}" {params}
+"""
+        
+        # Create hidden batch file in temp directory (unique per session, journaled before writing)
+        temp_bat = self.launch_journal.artifact_path(program_id)
+        self.launch_journal.record(program_id, temp_bat)
+        self.batch_files[program_id] = temp_bat
+        
+        with open(temp_bat, "w", encoding="cp949") as f:
+            f.write(batch_content)
+        
+        # Set batch file as hidden
+        try:
+            import win32file
+            win32file.SetFileAttributes(temp_bat, win32file.FILE_ATTRIBUTE_HIDDEN)
+        except ImportError:
+            pass
+        
+        # Execute batch file completely hidden
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = subprocess.SW_HIDE
+        
+        # Use cmd /c to execute batch file in hidden state
+        process = subprocess.Popen(['cmd', '/c', temp_bat], 
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   startupinfo=startupinfo,
+                                   creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS)
+    
+    def record_process_identity(self, program_id):
+        """Remember when the CG's PID was resolved and its create time (guards against PID reuse)"""
+        program_info = self.programs[program_id]
+        program_info['resolved_at'] = time.monotonic()
+        try:
+            program_info['create_time'] = psutil.Process(program_info['pid']).create_time()
+        except psutil.Error:
+            program_info['create_time'] = None
+    
+    def apply_affinity(self, program_id):
+        """Pin CG to the CPUs listed in its launch plan"""
+        program_info = self.programs[program_id]
+        affinity = program_info['plan'].affinity
+        if not affinity:
+            return
+        try:
+            psutil.Process(program_info['pid']).cpu_affinity(list(affinity))
+        except (psutil.Error, ValueError, AttributeError) as e:
+            self.logger.log(self.config_manager.get_message('profiles.affinity_error', id=program_id, error=str(e)))
+    
+    def restart_if_needed(self, program_info):
+        """Relaunch closed CG when its plan asks for it"""
+        plan = program_info.get('plan')
+        if plan is None or plan.restart != 'on_exit':
+            return None
+        restarts = program_info.get('restarts', 0)
+        if restarts >= plan.max_restarts:
+            self.logger.log(self.config_manager.get_message('profiles.restart_limit', name=plan.name, count=restarts))
+            return None
+        self.logger.log(self.config_manager.get_message('profiles.restarting', name=plan.name, count=restarts + 1))
+        return self.launch_plan(plan, restarts=restarts + 1, is_restart=True)
+    
+    def get_excluded_pids(self):
+        """PIDs that must not be picked up by name: our own and other launchers' CGs"""
+        tracked_pids = {info.get('pid') for info in self.programs.values() if info.get('pid')}
+        return list(tracked_pids | self.pid_registry.foreign_pids())
+    
+    def release_program(self, program_id, reason):
+        """Forget CG: release its registry claim and clean up its batch file"""
+        pid = self.programs[program_id].get('pid')
+        if pid:
+            self.pid_registry.release(pid)
+        self.cleanup_batch_file(program_id)
+        del self.programs[program_id]
+        self.event_bus.publish(ProgramExited(program_id, pid, reason))
+    
     def cleanup_batch_file(self, program_id):
         """Clean up batch file"""
         if program_id in self.batch_files:
@@ -98,6 +214,7 @@ start "" "{program_name}" {params}
                 self.logger.log(f"Failed to delete batch file: {e}")
             finally:
                 del self.batch_files[program_id]
+                self.launch_journal.remove(program_id)
     
     def auto_adjust_position(self, program_id):
         """Auto position adjustment using PowerShell (wait in Python)"""
@@ -120,13 +237,16 @@ start "" "{program_name}" {params}
             time.sleep(2)
             
             for attempt in range(1, max_attempts + 1):
+                # Stop retrying once the CG was terminated or closed
+                if self.programs.get(program_id) is not program_info:
+                    return
                 try:
-                    tracked_pids = [info.get('pid') for info in self.programs.values() if info.get('pid')]
-                    pid = self._adjust_position_powershell(program_info, x, y, tracked_pids)
+                    tracked_pids = self.get_excluded_pids()
+                    # By-name candidates are claimed before their window is touched
+                    pid = self._adjust_position_powershell(program_id, program_info, x, y, tracked_pids)
                     if pid:
-                        self.programs[program_id]['pid'] = pid
-                        self.programs[program_id]['status'] = 'Running'
-                        self.logger.log(self.config_manager.get_message('position_adjust_success', id=program_id, pid=pid))
+                        self.resolve_pid(program_id, pid)
+                        self.event_bus.publish(WindowPlaced(program_id, pid, (x, y), time.time() - program_info['launched_at']))
                         return
                     else:
                         self.logger.log(self.config_manager.get_message('progress.waiting_for_process', id=program_id, attempt=attempt))
@@ -138,56 +258,64 @@ start "" "{program_name}" {params}
         thread = threading.Thread(target=auto_adjust, daemon=True)
         thread.start()
     
-    def _adjust_position_powershell(self, program_info, x, y, tracked_pids):
-        """Position adjustment using PowerShell"""
+    def resolve_pid(self, program_id, pid):
+        """Record the PID found for a CG launched through a batch file"""
+        program_info = self.programs[program_id]
+        resolved = program_info['pid'] is None
+        program_info['pid'] = pid
+        program_info['status'] = 'Running'
+        if resolved:
+            self.record_process_identity(program_id)
+            self.apply_affinity(program_id)
+            self.event_bus.publish(PidResolved(program_id, pid))
+    
+    def claim_candidates(self, program_id, process_name, tracked_pids):
+        """Yield untracked PIDs of process_name, each claimed in the registry before it is yielded"""
+        excluded = set(tracked_pids)
+        for pid in self.process_snapshot.get().pids_by_name(f"{process_name}.exe"):
+            if pid in excluded:
+                continue
+            if not self.pid_registry.claim(pid):
+                # Another launcher instance owns this CG, keep looking
+                self.logger.log(self.config_manager.get_message('registry.pid_claimed_elsewhere', id=program_id, pid=pid))
+                continue
+            yield pid
+    
+    def _adjust_position_powershell(self, program_id, program_info, x, y, tracked_pids):
+        """Position adjustment using PowerShell, returns the PID whose window was moved"""
+        if program_info.get('pid'):
+            return self._set_window_pos_powershell(program_info['pid'], x, y)
+        # Only windows of PIDs we hold a claim on are moved
+        for pid in self.claim_candidates(program_id, program_info['process_name'], tracked_pids):
+            if self._set_window_pos_powershell(pid, x, y):
+                return pid
+            self.pid_registry.release(pid)
+        return None
+    
+    def _set_window_pos_powershell(self, pid, x, y):
+        """Move main window of a PID using PowerShell, returns the PID on success"""
         try:
-            process_name = program_info['process_name']
             timeout = self.config_manager.config['monitoring']['timeout']
-            if program_info.get('pid'):
-                ps_script = f"""
-                try {{
-                    $proc = Get-Process -Id {program_info['pid']} -ErrorAction Stop
-                    if ($proc.MainWindowHandle -ne [IntPtr]::Zero) {{
-                        Add-Type -MemberDefinition '[DllImport(\"user32.dll\")] public static extern bool SetWindowPos(IntPtr hWnd, IntPtr hWndInsertAfter, int X, int Y, int cx, int cy, uint uFlags);' -Name 'WinApi' -Namespace 'User32'
-                        $hwnd = $proc.MainWindowHandle
-                        $result = [User32.WinApi]::SetWindowPos($hwnd, 0, {x}, {y}, 640, 480, 0x0000)
-                        if ($result) {{
-                            Write-Host \"Success\"
-                            Write-Host $proc.Id
-                        }} else {{
-                            Write-Host \"Failed\"
-                        }}
+            ps_script = f"""
+            try {{
+                $proc = Get-Process -Id {pid} -ErrorAction Stop
+                if ($proc.MainWindowHandle -ne [IntPtr]::Zero) {{
+                    Add-Type -MemberDefinition '[DllImport(\"user32.dll\")] public static extern bool SetWindowPos(IntPtr hWnd, IntPtr hWndInsertAfter, int X, int Y, int cx, int cy, uint uFlags);' -Name 'WinApi' -Namespace 'User32'
+                    $hwnd = $proc.MainWindowHandle
+                    $result = [User32.WinApi]::SetWindowPos($hwnd, 0, {x}, {y}, 640, 480, 0x0000)
+                    if ($result) {{
+                        Write-Host \"Success\"
+                        Write-Host $proc.Id
                     }} else {{
-                        Write-Host \"No window\"
-                    }}
-                }} catch {{
-                    Write-Host \"Process not found\"
-                }}
-                """
-            else:
-                ps_script = f"""
-                $processName = '{process_name}'
-                $processes = Get-Process -Name $processName -ErrorAction SilentlyContinue
-                if ($processes) {{
-                    $trackedPids = @({', '.join([str(pid) for pid in tracked_pids])})
-                    foreach ($proc in $processes) {{
-                        if ($proc.Id -notin $trackedPids -and $proc.MainWindowHandle -ne [IntPtr]::Zero) {{
-                            Add-Type -MemberDefinition '[DllImport(\"user32.dll\")] public static extern bool SetWindowPos(IntPtr hWnd, IntPtr hWndInsertAfter, int X, int Y, int cx, int cy, uint uFlags);' -Name 'WinApi' -Namespace 'User32'
-                            $hwnd = $proc.MainWindowHandle
-                            $result = [User32.WinApi]::SetWindowPos($hwnd, 0, {x}, {y}, 640, 480, 0x0000)
-                            if ($result) {{
-                                Write-Host \"Success\"
-                                Write-Host $proc.Id
-                            }} else {{
-                                Write-Host \"Failed\"
-                            }}
-                            break
-                        }}
+                        Write-Host \"Failed\"
                     }}
                 }} else {{
-                    Write-Host \"Process not found\"
+                    Write-Host \"No window\"
                 }}
-                """
+            }} catch {{
+                Write-Host \"Process not found\"
+            }}
+            """
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             startupinfo.wShowWindow = subprocess.SW_HIDE
@@ -212,10 +340,14 @@ start "" "{program_name}" {params}
             program_info = self.programs[program_id]
             process_name = program_info['process_name']
             try:
-                tracked_pids = [info.get('pid') for info in self.programs.values() if info.get('pid')]
-                pid = self._adjust_position_powershell(program_info, x, y, tracked_pids)
+                tracked_pids = self.get_excluded_pids()
+                pid = self._adjust_position_powershell(program_id, program_info, x, y, tracked_pids)
                 if pid:
-                    self.logger.log(self.config_manager.get_message('position_adjust_manual_success', id=program_id))
+                    if program_id in self.programs:
+                        self.resolve_pid(program_id, pid)
+                    else:
+                        self.pid_registry.release(pid)
+                    self.event_bus.publish(WindowMoved(program_id, (x, y), 'manual'))
                 else:
                     self.logger.log(self.config_manager.get_message('warnings.process_not_found', id=program_id))
             except Exception as e:
@@ -242,21 +374,22 @@ start "" "{program_name}" {params}
                 except Exception as e:
                     self.logger.log(self.config_manager.get_message('errors.terminate_error', id=program_id, error=str(e)))
             else:
-                tracked_pids = [info.get('pid') for info in self.programs.values() if info.get('pid')]
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if (proc.info['name'] and 
-                        proc.info['name'].lower() == f"{process_name}.exe".lower() and
-                        proc.info['pid'] not in tracked_pids):
-                        proc.terminate()
-                        self.logger.log(self.config_manager.get_message('program_terminated', id=program_id, pid=proc.info['pid']))
-                        break
+                # Claim before terminating, so another instance's launching CG is never killed
+                for pid in self.claim_candidates(program_id, process_name, self.get_excluded_pids()):
+                    try:
+                        psutil.Process(pid).terminate()
+                    except psutil.NoSuchProcess:
+                        continue
+                    finally:
+                        self.pid_registry.release(pid)
+                    self.logger.log(self.config_manager.get_message('program_terminated', id=program_id, pid=pid))
+                    break
                 else:
                     self.logger.log(self.config_manager.get_message('warnings.process_not_found', id=program_id))
             
-            # Clean up batch file
-            self.cleanup_batch_file(program_id)
-            
-            del self.programs[program_id]
+            # Release PID claim and clean up batch file
+            self.release_program(program_id, 'terminated')
+            self.process_snapshot.invalidate()
         except Exception as e:
             self.logger.log(self.config_manager.get_message('errors.terminate_error', id=program_id, error=str(e)))
     
@@ -267,9 +400,10 @@ start "" "{program_name}" {params}
         for program_id in program_ids:
             self.terminate_program(program_id)
         
-        # Clean up any remaining batch files
+        # Clean up any remaining batch files and registry claims
         for program_id in list(self.batch_files.keys()):
             self.cleanup_batch_file(program_id)
+        self.pid_registry.release_all()
         
         self.logger.log(self.config_manager.get_message('all_programs_terminated'))
     
@@ -289,24 +423,20 @@ start "" "{program_name}" {params}
         """Get specific CG"""
         return self.programs.get(program_id)
     
-    def check_program_status(self, program_id):
-        """Check if CG is still running"""
+    def check_program_status(self, program_id, table=None):
+        """Check if CG is still running (against a shared process snapshot)"""
         if program_id not in self.programs:
             return False
         program_info = self.programs[program_id]
         if program_info.get('pid'):
-            try:
-                proc = psutil.Process(program_info['pid'])
-                if not proc.is_running():
-                    self.logger.log(self.config_manager.get_message('program_closed', id=program_id))
-                    # Clean up batch file when CG closes
-                    self.cleanup_batch_file(program_id)
-                    del self.programs[program_id]
-                    return False
-            except psutil.NoSuchProcess:
-                self.logger.log(self.config_manager.get_message('program_closed', id=program_id))
-                # Clean up batch file when CG closes
-                self.cleanup_batch_file(program_id)
-                del self.programs[program_id]
+            if table is None:
+                table = self.process_snapshot.get()
+            # A snapshot older than the PID itself cannot tell us anything yet
+            if table.taken_at < program_info.get('resolved_at', 0):
+                return True
+            if not table.is_alive(program_info['pid'], program_info.get('create_time')):
+                # Release PID claim and clean up batch file when CG closes
+                self.release_program(program_id, 'closed')
+                self.restart_if_needed(program_info)
                 return False
         return True 
\ No newline at end of file
@@ -0,0 +1,192 @@
+import time
+import threading
+from collections import deque
+
+import psutil
+
+def cron_field_matches(field, value, low):
+    """Check one cron field (*, lists, ranges and /steps) against a value"""
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/')
+            step = int(step)
+        if part == '*':
+            start, end = low, value
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-'))
+        else:
+            start = end = int(part)
+            if step != 1:
+                end = value
+        if start <= value <= end and (value - start) % step == 0:
+            return True
+    return False
+
+def cron_matches(expression, moment):
+    """Check 'minute hour day month weekday' expression against a time.struct_time (weekday 0 = Sunday)"""
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron expression needs 5 fields: '{expression}'")
+    values = (moment.tm_min, moment.tm_hour, moment.tm_mday, moment.tm_mon, (moment.tm_wday + 1) % 7)
+    lows = (0, 0, 1, 1, 0)
+    return all(cron_field_matches(f, v, low) for f, v, low in zip(fields, values, lows))
+
+class RotationScheduler:
+    """Rolling restarts of long-running CGs, a few at a time, in the same slot with the same params"""
+    def __init__(self, config_manager, logger, program_manager):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.program_manager = program_manager
+        self.settings = config_manager.config.get('rotation', {})
+        self.check_interval = self.settings.get('check_interval', 30)
+        self.policy = self.settings.get('policy', 'uptime')
+        self.max_uptime = self.settings.get('max_uptime_hours', 6) * 3600
+        self.schedule = self.settings.get('schedule', '0 4 * * *')
+        self.batch_size = max(1, self.settings.get('batch_size', 2))
+        self.max_offline = max(1, self.settings.get('max_offline', 2))
+        self.online_timeout = self.settings.get('online_timeout', 60)
+        self.settle_seconds = self.settings.get('settle_seconds', 10)
+        self.history = deque(maxlen=self.settings.get('history', 100))  # Finished rotations
+        self.last_cron_minute = None
+        self.rotating = threading.Lock()
+        self.stop_event = threading.Event()  # Wakes waits early when the launcher closes
+        self.thread = None
+        self.is_running = False
+
+    def is_enabled(self):
+        """Check if scheduled rotation is enabled"""
+        return self.settings.get('enabled', False)
+
+    def start(self):
+        """Start checking the rotation policy"""
+        if not self.is_enabled() or (self.thread and self.thread.is_alive()):
+            return
+        self.is_running = True
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop scheduling and wait until a rotation in progress has stopped launching"""
+        self.is_running = False
+        self.stop_event.set()
+        # Once the lock is free no restart can launch a CG behind terminate_all_programs()
+        if self.rotating.acquire(timeout=self.online_timeout):
+            self.rotating.release()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+
+    def run(self):
+        """Policy loop"""
+        while self.is_running:
+            try:
+                program_ids = self.get_due_programs()
+                if program_ids:
+                    self.rotate(program_ids)
+            except Exception as e:
+                self.logger.log(self.config_manager.get_message('rotation.error', error=str(e)))
+            self.stop_event.wait(self.check_interval)
+
+    def get_due_programs(self, now=None):
+        """CG IDs the policy wants restarted now, oldest first"""
+        if now is None:
+            now = time.time()
+        programs = [(info['launched_at'], program_id) for program_id, info in list(self.program_manager.get_programs().items())
+                    if info.get('pid') and info.get('plan') is not None]
+        if self.policy == 'cron':
+            moment = time.localtime(now)
+            minute = (moment.tm_year, moment.tm_yday, moment.tm_hour, moment.tm_min)
+            if minute == self.last_cron_minute or not cron_matches(self.schedule, moment):
+                return []
+            self.last_cron_minute = minute
+        else:
+            programs = [(launched_at, program_id) for launched_at, program_id in programs if now - launched_at >= self.max_uptime]
+        return [program_id for _, program_id in sorted(programs)]
+
+    def get_rss(self, pid):
+        """Resident memory of a process (0 if gone)"""
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except (psutil.Error, TypeError):
+            return 0
+
+    def restart_program(self, program_id):
+        """Terminate CG and launch it again in its current slot, returns (new program ID, RSS before)"""
+        info = self.program_manager.get_program(program_id)
+        if info is None or not info.get('pid'):
+            return None, 0
+        # The slot may have been changed after launch
+        plan = info['plan']._replace(position=info['position'], position_label=self.config_manager.get_position_name(info['position']))
+        rss_before = self.get_rss(info['pid'])
+        self.program_manager.terminate_program(program_id)
+        if not self.is_running:
+            return None, rss_before
+        new_id = self.program_manager.launch_plan(plan, restarts=info.get('restarts', 0), is_restart=True)
+        if new_id is None:
+            self.logger.log(self.config_manager.get_message('rotation.restart_failed', id=program_id))
+        else:
+            self.logger.log(self.config_manager.get_message('rotation.restarted', id=program_id, new_id=new_id))
+        return new_id, rss_before
+
+    def wait_online(self, program_ids):
+        """Wait until the new CGs have a PID (or the timeout passes)"""
+        deadline = time.monotonic() + self.online_timeout
+        pending = {program_id for program_id in program_ids if program_id is not None}
+        while pending and time.monotonic() < deadline and self.is_running:
+            for program_id in list(pending):
+                info = self.program_manager.get_program(program_id)
+                if info is None or info.get('pid'):
+                    pending.discard(program_id)
+            if pending:
+                self.stop_event.wait(0.5)
+        return not pending
+
+    def rotate(self, program_ids):
+        """Restart CGs in batches, never taking more than max_offline offline at once"""
+        if not self.rotating.acquire(blocking=False):
+            return None
+        try:
+            started = time.time()
+            self.logger.log(self.config_manager.get_message('rotation.started', count=len(program_ids)))
+            rss_before = 0
+            new_ids = []
+            # Each batch is back online (or timed out) before the next starts; CGs outside the rotation
+            # that never got a PID do not count, so they cannot stall it
+            batch_size = min(self.batch_size, self.max_offline)
+            remaining = list(program_ids)
+            while remaining and self.is_running:
+                batch, remaining = remaining[:batch_size], remaining[batch_size:]
+                batch_ids = []
+                for program_id in batch:
+                    if not self.is_running:
+                        break
+                    new_id, rss = self.restart_program(program_id)
+                    rss_before += rss
+                    if new_id is not None:
+                        batch_ids.append(new_id)
+                if not self.wait_online(batch_ids) and self.is_running:
+                    self.logger.log(self.config_manager.get_message('rotation.slow_start', ids=', '.join(map(str, batch_ids))))
+                new_ids.extend(batch_ids)
+                if remaining:
+                    self.stop_event.wait(self.settle_seconds)
+
+            # Let the fresh clients finish loading before measuring them
+            self.stop_event.wait(self.settle_seconds)
+            rss_after = sum(self.get_rss(info.get('pid')) for info in
+                            (self.program_manager.get_program(program_id) for program_id in new_ids) if info)
+            record = {
+                'started': started,
+                'duration': time.time() - started,
+                'restarted': len(new_ids),
+                'rss_before': rss_before,
+                'rss_after': rss_after,
+                'reclaimed': rss_before - rss_after,
+            }
+            self.history.append(record)
+            self.logger.log(self.config_manager.get_message('rotation.finished', count=record['restarted'],
+                                                            duration=f"{record['duration']:.0f}",
+                                                            reclaimed=f"{record['reclaimed'] / 1024 / 1024:.1f}"))
+            return record
+        finally:
+            self.rotating.release()
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+
+def parse_server_endpoints(params):
+    """Parse login server endpoints from CG parameters (IP:<index>:<host>:<port>)"""
+    endpoints = []
+    for token in params.split():
+        parts = token.split(':')
+        if len(parts) == 4 and parts[0].upper() == 'IP':
+            try:
+                endpoint = (parts[2], int(parts[3]))
+            except ValueError:
+                continue
+            if endpoint not in endpoints:
+                endpoints.append(endpoint)
+    return endpoints
+
+
+async def _probe_endpoint(host, port, timeout):
+    """Measure TCP connect latency to a single endpoint"""
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except asyncio.TimeoutError:
+        return (host, port), None, 'timeout'
+    except OSError as e:
+        return (host, port), None, e.strerror or str(e)
+    latency_ms = (time.perf_counter() - start) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return (host, port), latency_ms, None
+
+
+async def _probe_all(endpoints, timeout):
+    """Probe all endpoints concurrently"""
+    return await asyncio.gather(*[_probe_endpoint(host, port, timeout) for host, port in endpoints])
+
+
+class ServerProbe:
+    def __init__(self, config_manager, logger):
+        self.config_manager = config_manager
+        self.logger = logger
+        self.settings = config_manager.config.get('server_probe', {})
+        self.timeout = self.settings.get('timeout', 3)
+        self.cache_seconds = self.settings.get('cache_seconds', 10)
+        self.results = {}  # {(host, port): (checked_at, latency_ms, error)}
+        self.lock = threading.Lock()
+
+    def is_enabled(self):
+        """Check if pre-launch probing is enabled"""
+        return self.settings.get('enabled', False)
+
+    def probe(self, endpoints):
+        """Probe endpoints in parallel, returns {(host, port): (latency_ms, error)}"""
+        with self.lock:
+            # Launches started together share one probe round
+            now = time.monotonic()
+            stale = [ep for ep in endpoints
+                     if ep not in self.results or now - self.results[ep][0] > self.cache_seconds]
+            if stale:
+                for endpoint, latency_ms, error in asyncio.run(_probe_all(stale, self.timeout)):
+                    self.results[endpoint] = (time.monotonic(), latency_ms, error)
+            return {ep: self.results[ep][1:] for ep in endpoints}
+
+    def check_params(self, params_list):
+        """Probe all servers referenced by one or more parameter strings, returns True if launch may proceed"""
+        endpoints = []
+        for params in params_list:
+            for endpoint in parse_server_endpoints(params):
+                if endpoint not in endpoints:
+                    endpoints.append(endpoint)
+        if not endpoints:
+            return True
+
+        all_reachable = True
+        for (host, port), (latency_ms, error) in self.probe(endpoints).items():
+            if error is None:
+                self.logger.log(self.config_manager.get_message('server_probe.reachable', host=host, port=port, latency=f"{latency_ms:.1f}"))
+            else:
+                all_reachable = False
+                self.logger.log(self.config_manager.get_message('server_probe.unreachable', host=host, port=port, error=error))
+
+        if all_reachable:
+            return True
+        if self.settings.get('block_on_failure', False):
+            self.logger.log(self.config_manager.get_message('server_probe.launch_blocked'))
+            return False
+        self.logger.log(self.config_manager.get_message('server_probe.launch_warning'))
+        return True
@@ -0,0 +1,374 @@
+"""
+Optional sharded mode: CG launching and monitoring run in worker processes,
+each owning a shard of clients, and report back to the UI process in batches.
+
+Compare single-process and sharded modes from the command line:
+    python shard_manager.py --benchmark 300 --workers 4
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import dataclasses
+import argparse
+import tempfile
+import threading
+import itertools
+import multiprocessing
+
+from event_bus import PROGRAM_EVENTS, SweepCompleted
+from program_manager import ProgramManager
+
+def get_worker_count(settings):
+    """Number of shard workers (0 in config = half the CPU cores)"""
+    workers = settings.get('workers', 0)
+    return workers if workers > 0 else max(2, (os.cpu_count() or 2) // 2)
+
+class ForwardingLogger:
+    """Logger stand-in for shard workers: messages are forwarded to the UI process"""
+    def __init__(self):
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def log(self, message, level=None, program_id=None):
+        """Queue log message for the next batch"""
+        with self.lock:
+            self.pending.append((message, level, program_id))
+
+    def drain(self):
+        """Take queued messages"""
+        with self.lock:
+            messages, self.pending = self.pending, []
+        return messages
+
+def worker_main(shard_index, shard_count, config_file, config, commands, reports):
+    """Shard worker process: runs a ProgramManager and MonitorManager for its own CGs"""
+    from config_manager import ConfigManager
+    from event_bus import EventBus
+    from monitor_manager import MonitorManager
+
+    config_manager = ConfigManager(config_file)
+    config_manager.config = config
+    batch_interval = config['sharding'].get('batch_interval_ms', 100) / 1000
+    logger = ForwardingLogger()
+    event_bus = EventBus()
+    program_manager = ProgramManager(config_manager, logger, event_bus)
+    program_manager.next_program_id = shard_index + 1
+    program_manager.program_id_step = shard_count
+
+    pending_events = []
+    sweep_events = []  # Published by a monitor sweep still in progress
+    events_lock = threading.Lock()
+    flush_lock = threading.Lock()  # Keeps batches ordered before the results that follow them
+    def on_event(event):
+        with events_lock:
+            # A sweep in progress is sent as one batch once it ends; other threads' events go out as usual
+            (sweep_events if event_bus.is_holding() else pending_events).append(event)
+    for event_type in PROGRAM_EVENTS:
+        event_bus.subscribe(event_type, on_event)
+    # Sweeps are reported per shard
+    event_bus.subscribe(SweepCompleted, lambda event: on_event(dataclasses.replace(event, shard=shard_index)))
+
+    def flush():
+        """Send queued events, changed CG info and log messages as one message"""
+        with flush_lock:
+            with events_lock:
+                events = pending_events[:]
+                del pending_events[:]
+                if not event_bus.holds:
+                    events[:0] = sweep_events
+                    del sweep_events[:]
+            messages = logger.drain()
+            if not events and not messages:
+                return
+            programs = {}
+            for event in events:
+                if isinstance(event, SweepCompleted):
+                    continue
+                info = program_manager.programs.get(event.program_id)
+                programs[event.program_id] = dict(info) if info is not None else None
+            reports.put(('batch', shard_index, events, programs, messages))
+
+    running = True
+    def flush_loop():
+        while running:
+            time.sleep(batch_interval)
+            flush()
+    flusher = threading.Thread(target=flush_loop, daemon=True)
+    flusher.start()
+
+    monitor_manager = MonitorManager(config_manager, program_manager, logger)
+    monitor_manager.start_monitoring()
+
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            command, request_id, args = commands.get(timeout=1)
+        except queue.Empty:
+            # Do not outlive a launcher that was killed
+            if parent is not None and not parent.is_alive():
+                program_manager.terminate_all_programs()
+                break
+            continue
+        if command == 'stop':
+            break
+        try:
+            result = getattr(program_manager, command)(*args)
+        except Exception as e:
+            logger.log(config_manager.get_message('sharding.command_error', shard=shard_index, command=command, error=str(e)))
+            result = None
+        if request_id is not None:
+            # Let the CG's own events arrive before the caller sees the result
+            flush()
+            reports.put(('result', shard_index, request_id, result))
+
+    monitor_manager.stop_monitoring()
+    running = False
+    flush()
+
+class ShardedProgramManager(ProgramManager):
+    """ProgramManager whose CGs live in shard worker processes; the UI process keeps a mirror"""
+    def __init__(self, config_manager, logger, event_bus=None):
+        super().__init__(config_manager, logger, event_bus)
+        settings = config_manager.config.get('sharding', {})
+        self.shard_count = get_worker_count(settings)
+        self.command_timeout = settings.get('command_timeout', 30)
+        self.request_ids = itertools.count(1)
+        self.results = {}  # {request_id: [threading.Event, result]}
+        self.results_lock = threading.Lock()
+        self.launching = [0] * self.shard_count  # Launches in flight per shard, for load balancing
+        self.launching_lock = threading.Lock()
+
+        context = multiprocessing.get_context('spawn')
+        self.reports = context.Queue()
+        self.commands = []
+        self.workers = []
+        config_file = os.path.abspath(config_manager.config_file)
+        for shard_index in range(self.shard_count):
+            commands = context.Queue()
+            # Not daemonic: workers start their own process pools for integrity hashing
+            worker = context.Process(target=worker_main, name=f"cgmsv-shard-{shard_index}",
+                                     args=(shard_index, self.shard_count, config_file, config_manager.config, commands, self.reports))
+            worker.start()
+            self.commands.append(commands)
+            self.workers.append(worker)
+        # Runs before multiprocessing joins its non-daemonic children at exit
+        atexit.register(self.shutdown)
+        self.receiver_thread = threading.Thread(target=self.receive_reports, daemon=True)
+        self.receiver_thread.start()
+        self.logger.log(self.config_manager.get_message('sharding.started', count=self.shard_count))
+
+    def shard_of(self, program_id):
+        """Index of the shard that owns a CG"""
+        return (program_id - 1) % self.shard_count
+
+    def receive_reports(self):
+        """Apply worker batches to the mirror, then republish their events on the UI event bus"""
+        while True:
+            message = self.reports.get()
+            kind = message[0]
+            if kind == 'batch':
+                _, _, events, programs, messages = message
+                for program_id, info in programs.items():
+                    if info is None:
+                        self.programs.pop(program_id, None)
+                    else:
+                        self.programs[program_id] = info
+                for text, level, program_id in messages:
+                    self.logger.log(text, level, program_id)
+                for event in events:
+                    self.event_bus.publish(event)
+            elif kind == 'result':
+                with self.results_lock:
+                    waiter = self.results.get(message[2])
+                if waiter is not None:
+                    waiter[1] = message[3]
+                    waiter[0].set()
+
+    def send(self, shard_index, command, *args):
+        """Run ProgramManager method in a shard worker without waiting"""
+        self.commands[shard_index].put((command, None, args))
+
+    def request(self, shard_index, command, *args):
+        """Run ProgramManager method in a shard worker, returns (request_id, waiter) for collect()"""
+        request_id = next(self.request_ids)
+        waiter = [threading.Event(), None]
+        with self.results_lock:
+            self.results[request_id] = waiter
+        self.commands[shard_index].put((command, request_id, args))
+        return request_id, waiter
+
+    def collect(self, shard_index, command, request_id, waiter):
+        """Wait for the result of a request()"""
+        try:
+            if not waiter[0].wait(self.command_timeout):
+                self.logger.log(self.config_manager.get_message('sharding.timeout', shard=shard_index, command=command))
+                return None
+            return waiter[1]
+        finally:
+            with self.results_lock:
+                del self.results[request_id]
+
+    def call(self, shard_index, command, *args):
+        """Run ProgramManager method in a shard worker and wait for its result"""
+        return self.collect(shard_index, command, *self.request(shard_index, command, *args))
+
+    def reserve_shard(self):
+        """Pick the least loaded shard and count a launch in flight there"""
+        with self.launching_lock:
+            loads = list(self.launching)
+            for program_id in list(self.programs):
+                loads[self.shard_of(program_id)] += 1
+            shard_index = loads.index(min(loads))
+            self.launching[shard_index] += 1
+            return shard_index
+
+    def release_shard(self, shard_index):
+        """Count a launch in flight as finished"""
+        with self.launching_lock:
+            self.launching[shard_index] -= 1
+
+    def launch_plan(self, plan, probe=True, restarts=0, is_restart=False):
+        """Run CG in the least loaded shard"""
+        shard_index = self.reserve_shard()
+        try:
+            return self.call(shard_index, 'launch_plan', plan, probe, restarts, is_restart)
+        finally:
+            self.release_shard(shard_index)
+
+    def run_fleet(self, names=None):
+        """Run several profiles, sending every launch before waiting so the shards launch in parallel"""
+        pending = []
+        try:
+            for plan in self.get_fleet_plans(names):
+                shard_index = self.reserve_shard()
+                pending.append((shard_index, self.request(shard_index, 'launch_plan', plan, False)))
+            return [self.collect(shard_index, 'launch_plan', *request) for shard_index, request in pending]
+        finally:
+            for shard_index, _ in pending:
+                self.release_shard(shard_index)
+
+    def adjust_program_position(self, program_id, x, y):
+        """Adjust position of specific CG in its shard"""
+        self.send(self.shard_of(program_id), 'adjust_program_position', program_id, x, y)
+
+    def update_program_position(self, program_id, position_name):
+        """Update CG position information in the mirror and its shard"""
+        if not super().update_program_position(program_id, position_name):
+            return False
+        self.send(self.shard_of(program_id), 'update_program_position', program_id, position_name)
+        return True
+
+    def terminate_program(self, program_id):
+        """Terminate specific CG in its shard without waiting (ProgramExited updates the mirror)"""
+        if program_id not in self.programs:
+            self.logger.log(self.config_manager.get_message('errors.program_info_not_found', id=program_id))
+            return
+        self.send(self.shard_of(program_id), 'terminate_program', program_id)
+
+    def terminate_all_programs(self):
+        """Terminate all CGs in every shard without waiting (shutdown() waits for them)"""
+        for shard_index in range(self.shard_count):
+            self.send(shard_index, 'terminate_all_programs')
+
+    def check_program_status(self, program_id, table=None):
+        """Workers monitor their own CGs; the mirror only tells whether a CG is known"""
+        return program_id in self.programs
+
+    def shutdown(self):
+        """Stop shard workers once they have worked through their queued commands"""
+        for worker, commands in zip(self.workers, self.commands):
+            if worker.is_alive():
+                commands.put(('stop', None, ()))
+        for worker in self.workers:
+            worker.join(timeout=self.command_timeout)
+            if worker.is_alive():
+                worker.terminate()
+
+def run_benchmark(clients=300, workers=0, duration=20.0, frame_ms=16.0):
+    """Launch fake clients in single-process and sharded mode while timing a UI-like frame loop"""
+    from config_manager import ConfigManager
+    from logger import Logger
+    from event_bus import EventBus, ProgramLaunched
+    from monitor_manager import MonitorManager
+
+    work_dir = tempfile.mkdtemp(prefix='cgmsv_shard_bench_')
+    fake_client = sys.executable
+    fake_params = f'-S -c "import time; time.sleep({duration + 30})"'
+    results = {}
+
+    for mode in ('single', 'sharded'):
+        config_manager = ConfigManager()
+        config = config_manager.config
+        config['capture'] = dict(config.get('capture', {}), enabled=True, log_dir=os.path.join(work_dir, mode), backup_count=0)
+        config['pid_registry'] = {'file': os.path.join(work_dir, f'pids_{mode}.json')}
+        config['integrity'] = {'verify_before_launch': False}
+        config['monitoring'] = dict(config['monitoring'], max_position_attempts=0, check_interval=1)
+        config['sharding'] = dict(config.get('sharding', {}), enabled=mode == 'sharded', workers=workers)
+
+        logger = Logger(max_entries=50000, echo=False)
+        event_bus = EventBus()
+        logger.subscribe_events(event_bus, config_manager)
+        launched = []
+        event_bus.subscribe(ProgramLaunched, launched.append)
+        if mode == 'sharded':
+            program_manager = ShardedProgramManager(config_manager, logger, event_bus)
+            monitor_manager = None
+        else:
+            program_manager = ProgramManager(config_manager, logger, event_bus)
+            monitor_manager = MonitorManager(config_manager, program_manager, logger)
+            monitor_manager.start_monitoring()
+        # Stand-in for the UI's coalesced list refresh
+        event_bus.subscribe_batched(PROGRAM_EVENTS, lambda events: [dict(info) for info in list(program_manager.get_programs().values())])
+
+        def launch_all():
+            for _ in range(clients):
+                program_manager.run_program(fake_client, fake_params, config['defaults']['position'])
+        started = time.perf_counter()
+        launcher = threading.Thread(target=launch_all, daemon=True)
+        launcher.start()
+
+        # UI-like frame loop on the main thread: how late is each frame?
+        frame = frame_ms / 1000
+        frame_times = []
+        launch_time = None
+        last = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            time.sleep(frame)
+            now = time.perf_counter()
+            frame_times.append(now - last)
+            last = now
+            if launch_time is None and len(launched) >= clients:
+                launch_time = now - started
+
+        program_manager.terminate_all_programs()
+        if monitor_manager is not None:
+            monitor_manager.stop_monitoring()
+        if mode == 'sharded':
+            program_manager.shutdown()
+
+        frame_times.sort()
+        results[mode] = {
+            'fps': len(frame_times) / sum(frame_times),
+            'p99_ms': frame_times[int(len(frame_times) * 0.99)] * 1000,
+            'max_ms': frame_times[-1] * 1000,
+            'launch_s': launch_time,
+            'launched': len(launched),
+        }
+
+    print(f"{clients} clients, {duration:.0f}s per mode, {frame_ms:.0f} ms target frame")
+    for mode, r in results.items():
+        launch = f"{r['launch_s']:.1f}s" if r['launch_s'] is not None else f"incomplete ({r['launched']}/{clients})"
+        print(f"  {mode:8} {r['fps']:5.1f} fps, p99 frame {r['p99_ms']:6.1f} ms, worst frame {r['max_ms']:6.1f} ms, all launched in {launch}")
+    return results
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="CGMSV Launcher sharded mode benchmark")
+    parser.add_argument("--benchmark", type=int, default=300, help="number of fake clients per mode")
+    parser.add_argument("--workers", type=int, default=0, help="shard workers (0 = half the CPU cores)")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run each mode")
+    args = parser.parse_args()
+    run_benchmark(args.benchmark, args.workers, args.duration)
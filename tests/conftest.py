@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config_manager import ConfigManager
+from logger import Logger
+
+
+@pytest.fixture
+def config_manager():
+    """Config loaded from the repository's config.yml"""
+    return ConfigManager(os.path.join(ROOT, 'config.yml'))
+
+
+@pytest.fixture
+def logger():
+    """Logger without a widget or console output"""
+    return Logger(echo=False)
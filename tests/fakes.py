@@ -0,0 +1,42 @@
+"""Test doubles shared by the test modules"""
+
+from event_bus import EventBus
+from placement_manager import WindowBackend
+
+
+class FakeProgramManager:
+    """Stand-in for ProgramManager holding a fixed {program_id: info} dict"""
+    def __init__(self, programs=None):
+        self.programs = dict(programs or {})
+        self.event_bus = EventBus()
+
+    def get_programs(self):
+        return self.programs
+
+    def get_program(self, program_id):
+        return self.programs.get(program_id)
+
+
+class FakeWindowBackend(WindowBackend):
+    """In-memory WindowBackend for tests: windows are (hwnd, rect) per PID"""
+    def __init__(self, windows=None, foreground_pid=None):
+        self.windows = dict(windows or {})  # {pid: (hwnd, (x, y, width, height))}
+        self.foreground_pid = foreground_pid
+        self.moves = []  # [(hwnd, (x, y, width, height))]
+
+    def get_window_rects(self, pids):
+        """Get rectangles of the requested PIDs that have a window"""
+        return {pid: self.windows[pid] for pid in pids if pid in self.windows}
+
+    def set_window_pos(self, hwnd, x, y, width, height):
+        """Record the move and update the window"""
+        self.moves.append((hwnd, (x, y, width, height)))
+        for pid, (window, _) in self.windows.items():
+            if window == hwnd:
+                self.windows[pid] = (hwnd, (x, y, width, height))
+                return True
+        return False
+
+    def get_foreground_pid(self):
+        """Get the PID set as foreground"""
+        return self.foreground_pid
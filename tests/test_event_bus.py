@@ -0,0 +1,80 @@
+import time
+import threading
+
+from event_bus import EventBus, ProgramLaunched, ProgramExited
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def subscribe_batches(bus):
+    batches = []
+    bus.subscribe_batched((ProgramLaunched, ProgramExited), lambda events: batches.append(len(events)))
+    return batches
+
+
+def test_burst_is_coalesced_into_one_batch():
+    bus = EventBus(coalesce_interval=0.05)
+    batches = subscribe_batches(bus)
+    for program_id in range(5):
+        bus.publish(ProgramLaunched(program_id, 'cg.exe', (0, 0)))
+    assert wait_for(lambda: sum(batches) == 5)
+    assert batches == [5]
+
+
+def test_empty_hold_does_not_split_the_next_burst():
+    bus = EventBus(coalesce_interval=0.05)
+    batches = subscribe_batches(bus)
+    with bus.hold():
+        pass
+    for program_id in range(5):
+        bus.publish(ProgramLaunched(program_id, 'cg.exe', (0, 0)))
+    assert wait_for(lambda: sum(batches) == 5)
+    assert batches == [5]
+
+
+def test_hold_delivers_slow_burst_as_one_batch():
+    bus = EventBus(coalesce_interval=0.02)
+    batches = subscribe_batches(bus)
+    with bus.hold():
+        for program_id in range(10):
+            bus.publish(ProgramExited(program_id, None, 'closed'))
+            time.sleep(0.01)
+        assert batches == []
+    assert wait_for(lambda: sum(batches) == 10)
+    assert batches == [10]
+
+
+def test_hold_does_not_delay_other_threads():
+    bus = EventBus(coalesce_interval=0.02)
+    batches = subscribe_batches(bus)
+    with bus.hold():
+        bus.publish(ProgramExited(1, None, 'closed'))
+        thread = threading.Thread(target=bus.publish, args=(ProgramLaunched(2, 'cg.exe', (0, 0)),))
+        thread.start()
+        thread.join()
+        assert wait_for(lambda: batches == [1])
+    assert wait_for(lambda: batches == [1, 1])
+
+
+def test_synchronous_subscribers_are_not_held():
+    bus = EventBus()
+    seen = []
+    bus.subscribe(ProgramLaunched, seen.append)
+    with bus.hold():
+        bus.publish(ProgramLaunched(1, 'cg.exe', (0, 0)))
+        assert len(seen) == 1
+
+
+def test_handler_errors_go_to_error_handler():
+    bus = EventBus(coalesce_interval=0.01)
+    errors = []
+    bus.error_handler = errors.append
+    bus.subscribe_batched((ProgramLaunched,), lambda events: 1 / 0)
+    bus.publish(ProgramLaunched(1, 'cg.exe', (0, 0)))
+    assert wait_for(lambda: errors)
+    assert isinstance(errors[0], ZeroDivisionError)
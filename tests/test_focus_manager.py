@@ -0,0 +1,73 @@
+import sys
+import subprocess
+
+import pytest
+
+from fakes import FakeProgramManager, FakeWindowBackend
+from focus_manager import FocusPriorityManager
+
+
+@pytest.fixture
+def processes():
+    """Two sleeping processes standing in for CGs"""
+    started = [subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']) for _ in range(2)]
+    yield [process.pid for process in started]
+    for process in started:
+        process.kill()
+        process.wait()
+
+
+@pytest.fixture
+def backend():
+    return FakeWindowBackend()
+
+
+@pytest.fixture
+def manager(config_manager, logger, processes, backend):
+    config_manager.config['focus_priority'] = {'enabled': True, 'debounce_ms': 500}
+    programs = FakeProgramManager({program_id: {'pid': pid} for program_id, pid in enumerate(processes, 1)})
+    return FocusPriorityManager(config_manager, logger, programs, backend)
+
+
+def test_clients_start_in_background_class(manager, processes):
+    manager.tick(0.0)
+    assert manager.applied == {pid: manager.background_priority for pid in processes}
+
+
+def test_focus_is_applied_after_debounce(manager, processes, backend):
+    first = processes[0]
+    manager.tick(0.0)
+    backend.foreground_pid = first
+    manager.tick(1.0)
+    manager.tick(1.3)
+    assert manager.focused_pid is None
+    manager.tick(1.5)
+    assert manager.focused_pid == first
+    assert manager.applied[first] == manager.focused_priority
+    assert len(manager.switch_latencies) == 1
+    assert manager.switch_latencies[0] >= 0.5
+
+
+def test_brief_switch_away_is_ignored(manager, processes, backend):
+    first, second = processes
+    backend.foreground_pid = first
+    manager.tick(1.0)
+    manager.tick(1.5)
+    backend.foreground_pid = second
+    manager.tick(2.0)
+    backend.foreground_pid = first
+    manager.tick(2.2)
+    manager.tick(3.0)
+    assert manager.focused_pid == first
+    assert len(manager.switch_latencies) == 1
+
+
+def test_other_app_focused_keeps_last_boost(manager, processes, backend):
+    first = processes[0]
+    backend.foreground_pid = first
+    manager.tick(1.0)
+    manager.tick(1.5)
+    backend.foreground_pid = None
+    manager.tick(4.0)
+    manager.tick(5.0)
+    assert manager.focused_pid == first
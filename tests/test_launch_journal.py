@@ -0,0 +1,56 @@
+import os
+import json
+import time
+
+import pytest
+
+from launch_journal import LaunchJournal
+
+
+@pytest.fixture
+def journal(config_manager, logger, tmp_path):
+    config_manager.config['launch_journal'] = {'temp_dir': str(tmp_path), 'min_orphan_age': 60}
+    return LaunchJournal(config_manager, logger)
+
+
+def write_session(tmp_path, session, owner, artifacts=1):
+    """Journal and batch files of another launcher session, returns the batch file paths"""
+    paths = [str(tmp_path / f"cgmsv_{session}_{program_id}.bat") for program_id in range(1, artifacts + 1)]
+    for path in paths:
+        open(path, 'w').close()
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+    with open(tmp_path / f"cgmsv_journal_{session}.json", 'w', encoding='utf-8') as f:
+        json.dump({'owner': owner, 'artifacts': paths}, f)
+    return paths
+
+
+def test_dead_launcher_artifacts_are_reaped(journal, tmp_path):
+    paths = write_session(tmp_path, 'dead-1', [os.getpid(), 0.0], artifacts=2)
+    removed = journal.reap()
+    assert set(paths) <= set(removed)
+    assert not any(os.path.exists(path) for path in paths)
+    assert not os.path.exists(tmp_path / 'cgmsv_journal_dead-1.json')
+
+
+def test_live_launcher_artifacts_are_kept(journal, tmp_path):
+    paths = write_session(tmp_path, 'a1ce-1', journal.owner)
+    assert journal.reap() == []
+    assert os.path.exists(paths[0])
+
+
+def test_unreadable_journal_is_skipped(journal, tmp_path):
+    paths = write_session(tmp_path, 'b0b-1', [os.getpid(), 0.0])
+    with open(tmp_path / 'cgmsv_journal_b0b-1.json', 'w', encoding='utf-8') as f:
+        f.write('{"owner": [')  # Half-written
+    assert journal.reap() == []
+    assert os.path.exists(paths[0])
+    assert os.path.exists(tmp_path / 'cgmsv_journal_b0b-1.json')
+
+
+def test_own_session_is_never_reaped(journal):
+    path = journal.artifact_path(1)
+    journal.record(1, path)
+    open(path, 'w').close()
+    assert journal.reap() == []
+    assert os.path.exists(path)
@@ -0,0 +1,37 @@
+import tracemalloc
+
+import pytest
+
+from memory_diagnostics import MemoryDiagnostics
+from program_manager import ProgramManager
+
+
+@pytest.fixture
+def diagnostics(config_manager, logger, tmp_path):
+    config_manager.config['pid_registry'] = {'file': str(tmp_path / 'pids.json')}
+    config_manager.config['launch_journal'] = {'temp_dir': str(tmp_path)}
+    program_manager = ProgramManager(config_manager, logger)
+    yield MemoryDiagnostics(config_manager, logger, program_manager)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def test_tracing_runs_only_between_two_reports(diagnostics, config_manager):
+    assert not tracemalloc.is_tracing()
+    first = diagnostics.report()
+    assert config_manager.get_message('diagnostics.tracing_started') in first
+    assert tracemalloc.is_tracing()
+
+    kept = [bytearray(1024) for _ in range(100)]
+    second = diagnostics.report()
+    assert config_manager.get_message('diagnostics.tracing_stopped') in second
+    assert any('test_memory_diagnostics.py' in line for line in second)
+    assert not tracemalloc.is_tracing()
+    del kept
+
+
+def test_tracing_started_elsewhere_is_left_on(diagnostics):
+    tracemalloc.start()
+    diagnostics.report()
+    diagnostics.report()
+    assert tracemalloc.is_tracing()
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from event_bus import ProgramLaunched, ProgramExited, SweepCompleted
+from fakes import FakeProgramManager
+from metrics_exporter import MetricsExporter
+
+
+@pytest.fixture
+def programs():
+    return FakeProgramManager({1: {'pid': os.getpid()}})
+
+
+@pytest.fixture
+def exporter(config_manager, logger, programs):
+    return MetricsExporter(config_manager, logger, programs)
+
+
+def test_restarts_are_counted_from_the_event(exporter, programs):
+    programs.event_bus.publish(ProgramLaunched(2, 'cg.exe', (0, 0)))
+    programs.event_bus.publish(ProgramLaunched(3, 'cg.exe', (0, 0), restart=True))
+    assert exporter.launches.values[()] == 2
+    assert exporter.restarts.values[()] == 1
+    assert exporter.clients_running.values[()] == 3
+
+
+def test_sweep_duration_is_labelled_by_shard(exporter, programs):
+    programs.event_bus.publish(SweepCompleted(0.01, 3, shard=0))
+    programs.event_bus.publish(SweepCompleted(0.02, 4, shard=1))
+    assert exporter.sweep_duration.values == {(0,): 0.01, (1,): 0.02}
+    assert 'cgmsv_monitor_sweep_seconds{shard="1"} 0.02' in exporter.render_text()
+
+
+def test_exited_client_is_not_sampled_again(exporter, programs):
+    exporter.sample_clients()
+    exporter.sample_clients()
+    assert (1,) in exporter.client_rss.values
+    del programs.programs[1]
+    programs.event_bus.publish(ProgramExited(1, os.getpid(), 'closed'))
+    exporter.sample_clients()
+    assert exporter.processes == {}
+    assert (1,) not in exporter.client_rss.values
+
+
+def test_client_that_exits_during_sampling_is_not_kept(exporter, programs):
+    snapshot = dict(programs.programs)
+    calls = []
+
+    def get_programs():
+        # The CG exits right after sample_clients() took its snapshot
+        calls.append(1)
+        return snapshot if len(calls) == 1 else {}
+    programs.get_programs = get_programs
+    exporter.sample_clients()
+    assert exporter.processes == {}
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+from output_capture import OutputCaptureManager, RotatingOutputFile
+
+
+def test_log_paths_differ_between_sessions(config_manager, logger):
+    first = OutputCaptureManager(config_manager, logger, 'a1-100')
+    second = OutputCaptureManager(config_manager, logger, 'b2-200')
+    assert first.get_log_path(1, 'cg.exe') != second.get_log_path(1, 'cg.exe')
+    assert os.path.basename(first.get_log_path(1, 'cg.exe')) == 'cg_a1-100_1_cg.log'
+
+
+def test_rotating_output_file_keeps_backups(tmp_path):
+    path = str(tmp_path / 'out.log')
+    output = RotatingOutputFile(path, max_bytes=10, backup_count=2)
+    for chunk in (b'a' * 8, b'b' * 8, b'c' * 8, b'd' * 8):
+        output.write(chunk)
+    output.close()
+    assert open(path, 'rb').read() == b'd' * 8
+    assert open(path + '.1', 'rb').read() == b'c' * 8
+    assert open(path + '.2', 'rb').read() == b'b' * 8
+    assert not os.path.exists(path + '.3')
+
+
+def test_launch_captures_output(config_manager, logger, tmp_path):
+    config_manager.config['capture'] = {'enabled': True, 'log_dir': str(tmp_path)}
+    capture = OutputCaptureManager(config_manager, logger, 'test')
+    capture.launch(1, [sys.executable, '-c', 'print("hello from client")'], str(tmp_path))
+    log_path = capture.get_log_path(1, os.path.basename(sys.executable))
+    deadline = time.monotonic() + 10
+    while 'exited with code' not in open(log_path, encoding='utf-8').read() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert 'hello from client' in open(log_path, encoding='utf-8').read()
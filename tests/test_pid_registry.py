@@ -0,0 +1,52 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from pid_registry import PidRegistry
+
+
+@pytest.fixture
+def client():
+    """Sleeping process standing in for a CG"""
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    yield process.pid
+    process.kill()
+    process.wait()
+
+
+@pytest.fixture
+def registries(config_manager, logger, tmp_path):
+    """This launcher's registry and one acting for another live launcher"""
+    config_manager.config['pid_registry'] = {'file': str(tmp_path / 'pids.json')}
+    ours = PidRegistry(config_manager, logger)
+    other_launcher = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    theirs = PidRegistry(config_manager, logger)
+    theirs.owner = theirs._identity(other_launcher.pid)
+    yield ours, theirs
+    other_launcher.kill()
+    other_launcher.wait()
+
+
+def test_claimed_pid_is_foreign_to_other_launchers(registries, client):
+    ours, theirs = registries
+    assert theirs.claim(client)
+    assert not ours.claim(client)
+    assert ours.foreign_pids() == {client}
+    assert theirs.foreign_pids() == set()
+
+
+def test_release_frees_pid(registries, client):
+    ours, theirs = registries
+    assert theirs.claim(client)
+    theirs.release(client)
+    assert ours.claim(client)
+    assert theirs.foreign_pids() == {client}
+
+
+def test_claims_of_dead_launchers_are_dropped(registries, client):
+    ours, theirs = registries
+    theirs.owner = [os.getpid(), 0.0]  # Identity no running process has
+    assert theirs.claim(client)
+    assert ours.claim(client)
@@ -0,0 +1,58 @@
+import pytest
+
+from event_bus import WindowMoved
+from fakes import FakeProgramManager, FakeWindowBackend
+from placement_manager import PlacementVerifier, WindowBackend
+
+
+@pytest.fixture
+def window_size(config_manager):
+    return config_manager.config['defaults'].get('window_size', [640, 480])
+
+
+@pytest.fixture
+def programs():
+    return FakeProgramManager({1: {'pid': 101, 'position': (0, 0)}, 2: {'pid': 102, 'position': (640, 0)}})
+
+
+@pytest.fixture
+def backend(window_size):
+    width, height = window_size
+    # Second window is off by one pixel, inside the default tolerance
+    return FakeWindowBackend({101: (1001, (0, 0, width, height)), 102: (1002, (641, 1, width, height))})
+
+
+@pytest.fixture
+def verifier(config_manager, logger, programs, backend):
+    config_manager.config['monitoring']['drift_tolerance'] = 2
+    return PlacementVerifier(config_manager, programs, logger, backend)
+
+
+def test_window_backend_is_abstract():
+    with pytest.raises(TypeError):
+        WindowBackend()
+
+
+def test_windows_within_tolerance_are_not_moved(verifier, backend):
+    assert verifier.verify() == []
+    assert backend.moves == []
+
+
+def test_only_drifted_window_is_moved_back(verifier, backend, programs, window_size):
+    width, height = window_size
+    moved = []
+    programs.event_bus.subscribe(WindowMoved, moved.append)
+    backend.windows[102] = (1002, (700, 40, width, height))
+
+    assert verifier.verify() == [2]
+    assert backend.moves == [(1002, (640, 0, width, height))]
+    assert [(event.program_id, event.source) for event in moved] == [(2, 'drift')]
+    assert verifier.verify() == []
+    assert len(backend.moves) == 1
+
+
+def test_failed_move_is_not_reported(verifier, backend, window_size):
+    width, height = window_size
+    backend.windows[102] = (1002, (700, 40, width, height))
+    backend.set_window_pos = lambda hwnd, x, y, w, h: False
+    assert verifier.verify() == []
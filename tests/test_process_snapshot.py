@@ -0,0 +1,28 @@
+import os
+
+import psutil
+
+from process_snapshot import ProcessSnapshotService, ProcessTable
+
+
+def test_table_lookups():
+    table = ProcessTable(0.0)
+    table.add(10, 100.0, 'CG.exe')
+    table.add(11, 200.0, 'cg.exe')
+    table.add(12, 300.0, 'other.exe')
+    assert len(table) == 3
+    assert table.pids_by_name('cg.EXE') == [10, 11]
+    assert table.is_alive(10)
+    assert table.is_alive(10, 100.0)
+    assert not table.is_alive(10, 150.0)  # Same PID, different process
+    assert not table.is_alive(13)
+
+
+def test_snapshot_is_shared_until_stale_or_invalidated():
+    service = ProcessSnapshotService(max_age=60)
+    table = service.get()
+    assert table.is_alive(os.getpid(), psutil.Process().create_time())
+    assert service.get() is table
+    service.invalidate()
+    assert service.get() is not table
+    assert service.get(max_age=0) is not table
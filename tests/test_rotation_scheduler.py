@@ -0,0 +1,99 @@
+import time
+import threading
+from collections import namedtuple
+
+import pytest
+
+from fakes import FakeProgramManager
+from rotation_scheduler import RotationScheduler, cron_matches
+
+Plan = namedtuple('Plan', 'name position position_label')
+
+
+class RotatingProgramManager(FakeProgramManager):
+    """FakeProgramManager whose relaunched CGs get a PID after start_delay seconds"""
+    def __init__(self, programs, start_delay=0.0, fail_launch=False):
+        super().__init__(programs)
+        self.start_delay = start_delay
+        self.fail_launch = fail_launch
+        self.launches = []  # [(plan, is_restart)]
+        self.max_starting = 0
+        self.next_id = max(programs) + 1
+
+    def terminate_program(self, program_id):
+        self.programs.pop(program_id, None)
+
+    def launch_plan(self, plan, probe=True, restarts=0, is_restart=False):
+        self.launches.append((plan, is_restart))
+        if self.fail_launch:
+            return None
+        program_id, self.next_id = self.next_id, self.next_id + 1
+        self.programs[program_id] = {'pid': None, 'plan': plan, 'position': plan.position, 'launched_at': time.time()}
+        starting = sum(1 for info in self.programs.values() if info['pid'] is None and info.get('plan') is not None)
+        self.max_starting = max(self.max_starting, starting)
+        threading.Timer(self.start_delay, self.programs[program_id].update, kwargs={'pid': 10000 + program_id}).start()
+        return program_id
+
+
+def running(count, launched_at=0.0):
+    return {program_id: {'pid': 1000 + program_id, 'plan': Plan(f'p{program_id}', (0, 0), 'Top Left'),
+                         'position': (0, 0), 'launched_at': launched_at} for program_id in range(1, count + 1)}
+
+
+@pytest.fixture
+def make_scheduler(config_manager, logger):
+    def make(programs, **settings):
+        config_manager.config['rotation'] = dict({'enabled': True, 'batch_size': 2, 'max_offline': 2,
+                                                  'online_timeout': 1, 'settle_seconds': 0}, **settings)
+        scheduler = RotationScheduler(config_manager, logger, programs)
+        scheduler.is_running = True
+        return scheduler
+    return make
+
+
+def test_rotation_restarts_every_due_client(make_scheduler):
+    programs = RotatingProgramManager(running(5), start_delay=0.05)
+    scheduler = make_scheduler(programs)
+    record = scheduler.rotate(scheduler.get_due_programs(now=7 * 3600))
+    assert record['restarted'] == 5
+    assert all(is_restart for _, is_restart in programs.launches)
+    assert programs.max_starting <= 2
+
+
+def test_client_without_pid_does_not_stall_rotation(make_scheduler):
+    stuck = {99: {'pid': None, 'plan': None, 'position': (0, 0), 'launched_at': 0.0}}
+    programs = RotatingProgramManager({**running(3), **stuck})
+    scheduler = make_scheduler(programs, max_offline=1)
+    started = time.monotonic()
+    record = scheduler.rotate([1, 2, 3])
+    assert record['restarted'] == 3
+    assert time.monotonic() - started < 5
+
+
+def test_failed_relaunch_is_not_reported_as_rotated(make_scheduler, logger, config_manager):
+    programs = RotatingProgramManager(running(1), fail_launch=True)
+    scheduler = make_scheduler(programs)
+    record = scheduler.rotate([1])
+    assert record['restarted'] == 0
+    messages = logger.get_messages()
+    assert any(config_manager.get_message('rotation.restart_failed', id=1) in message for message in messages)
+
+
+def test_stop_prevents_further_relaunches(make_scheduler):
+    programs = RotatingProgramManager(running(4), start_delay=10)
+    scheduler = make_scheduler(programs, batch_size=1, max_offline=1, online_timeout=30)
+    thread = threading.Thread(target=scheduler.rotate, args=([1, 2, 3, 4],))
+    thread.start()
+    time.sleep(0.2)
+    scheduler.stop()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert len(programs.launches) == 1
+
+
+def test_cron_matches():
+    moment = time.strptime('2026-10-18 04:00', '%Y-%m-%d %H:%M')  # A Sunday
+    assert cron_matches('0 4 * * *', moment)
+    assert cron_matches('*/15 3-5 * 10 0', moment)
+    assert not cron_matches('0 4 * * 1-5', moment)
+    assert not cron_matches('30 4 * * *', moment)
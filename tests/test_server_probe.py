@@ -0,0 +1,58 @@
+import socket
+
+import pytest
+
+from server_probe import ServerProbe, parse_server_endpoints
+
+
+@pytest.fixture
+def probe(config_manager, logger):
+    config_manager.config['server_probe'] = {'enabled': True, 'timeout': 1, 'cache_seconds': 60, 'block_on_failure': True}
+    return ServerProbe(config_manager, logger)
+
+
+@pytest.fixture
+def open_port():
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    yield listener
+    listener.close()
+
+
+@pytest.fixture
+def closed_port():
+    closed = socket.socket()
+    closed.bind(('127.0.0.1', 0))
+    port = closed.getsockname()[1]
+    closed.close()  # Nothing listens here any more
+    return port
+
+
+def test_parse_server_endpoints():
+    params = "user pass IP:0:10.0.0.1:9030 IP:1:login.example:9031 IP:2:10.0.0.1:9030 IP:3:bad:port"
+    assert parse_server_endpoints(params) == [('10.0.0.1', 9030), ('login.example', 9031)]
+
+
+def test_probe_reports_reachable_and_closed_ports(probe, open_port, closed_port):
+    port = open_port.getsockname()[1]
+    results = probe.probe([('127.0.0.1', port), ('127.0.0.1', closed_port)])
+    assert results[('127.0.0.1', port)][1] is None
+    assert results[('127.0.0.1', closed_port)][1] is not None
+
+
+def test_check_params_blocks_only_unreachable_servers(probe, open_port, closed_port):
+    assert probe.check_params([f"IP:0:127.0.0.1:{open_port.getsockname()[1]}"])
+    assert not probe.check_params([f"IP:0:127.0.0.1:{closed_port}"])
+
+
+def test_check_params_warns_without_block_on_failure(probe, closed_port):
+    probe.settings['block_on_failure'] = False
+    assert probe.check_params([f"IP:0:127.0.0.1:{closed_port}"])
+
+
+def test_results_are_cached(probe, open_port):
+    port = open_port.getsockname()[1]
+    probe.probe([('127.0.0.1', port)])
+    open_port.close()
+    assert probe.probe([('127.0.0.1', port)])[('127.0.0.1', port)][1] is None
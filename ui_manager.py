@@ -1,25 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
-import time
 import os
 
+from log_view import LogView
+from event_bus import PROGRAM_EVENTS
+
 class UIManager:
-    def __init__(self, root, config_manager, program_manager, logger):
+    def __init__(self, root, config_manager, program_manager, logger, memory_diagnostics=None):
         self.root = root
         self.config_manager = config_manager
         self.program_manager = program_manager
         self.logger = logger
+        self.memory_diagnostics = memory_diagnostics
         self.config = config_manager.get_config()
         
         # UI components
         self.path_display = None
         self.param_input = None
         self.default_position = None
+        self.profile_var = None
+        self.profile_combo = None
         self.new_position = None
         self.program_tree = None
-        self.log_text = None
+        self.log_view = None
         
         self.init_ui()
+        
+        # Refresh CG list once per burst of state changes
+        self.program_manager.event_bus.subscribe_batched(PROGRAM_EVENTS, lambda events: self.update_program_list())
     
     def init_ui(self):
         """Initialize UI"""
@@ -81,6 +89,21 @@ class UIManager:
         # Run button
         run_button = ttk.Button(add_frame, text=self.config['ui']['add_program']['run_button'], command=self.run_program_threaded)
         run_button.pack()
+        
+        # Profile selection
+        add_config = self.config['ui']['add_program']
+        profile_frame = ttk.Frame(add_frame)
+        profile_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Label(profile_frame, text=add_config.get('profile_label', 'Profile:')).pack(side=tk.LEFT)
+        self.profile_var = tk.StringVar()
+        self.profile_combo = ttk.Combobox(profile_frame, textvariable=self.profile_var, state='readonly',
+                                          postcommand=self.update_profile_choices)
+        self.profile_combo.pack(side=tk.LEFT, padx=(10, 10))
+        ttk.Button(profile_frame, text=add_config.get('run_profile_button', 'Run Profile'),
+                   command=self.run_profile_threaded).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(profile_frame, text=add_config.get('run_all_profiles_button', 'Run All Profiles'),
+                   command=self.run_fleet_threaded).pack(side=tk.LEFT)
     
     def create_program_list_section(self, parent):
         """Create CG list section"""
@@ -128,7 +151,10 @@ class UIManager:
         controls = self.config['ui']['controls']
         ttk.Button(control_frame, text=controls['position_adjust'], command=self.adjust_selected_position).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(control_frame, text=controls['terminate_program'], command=self.terminate_selected_program).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(control_frame, text=controls['terminate_all'], command=self.terminate_all_programs).pack(side=tk.LEFT)
+        ttk.Button(control_frame, text=controls['terminate_all'], command=self.terminate_all_programs).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(control_frame, text=controls.get('update_manifest', 'Update Manifest'), command=self.update_manifest_threaded).pack(side=tk.LEFT, padx=(0, 10))
+        if self.memory_diagnostics:
+            ttk.Button(control_frame, text=controls.get('memory_report', 'Memory Report'), command=self.memory_report_threaded).pack(side=tk.LEFT)
         
         # Position change frame
         pos_change_frame = ttk.LabelFrame(control_frame, text=self.config['ui']['position_change']['title'], padding="5")
@@ -144,12 +170,8 @@ class UIManager:
         log_frame = ttk.LabelFrame(parent, text=self.config['ui']['log']['title'], padding="5")
         log_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.log_text = tk.Text(log_frame, height=self.config['launcher']['log_height'], wrap=tk.WORD)
-        log_scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=log_scrollbar.set)
-        
-        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_view = LogView(log_frame, self.logger.store, self.config)
+        self.log_view.pack(fill=tk.BOTH, expand=True)
     
     def select_program_file(self):
         """Select CG program file"""
@@ -173,6 +195,24 @@ class UIManager:
         thread = threading.Thread(target=run_in_thread, daemon=True)
         thread.start()
     
+    def update_profile_choices(self):
+        """Fill profile selector from config"""
+        self.profile_combo['values'] = list(self.program_manager.profile_manager.get_plans())
+    
+    def run_profile_threaded(self):
+        """Run selected profile in thread"""
+        import threading
+        
+        name = self.profile_var.get()
+        if name:
+            threading.Thread(target=self.program_manager.run_profile, args=(name,), daemon=True).start()
+    
+    def run_fleet_threaded(self):
+        """Run all profiles in thread"""
+        import threading
+        
+        threading.Thread(target=self.program_manager.run_fleet, daemon=True).start()
+    
     def run_program(self):
         """Run CG program"""
         program_path = self.path_display.cget("text")
@@ -183,9 +223,7 @@ class UIManager:
         params = self.param_input.get().strip()
         position_name = self.default_position.get()
         
-        program_id = self.program_manager.run_program(program_path, params, position_name)
-        if program_id:
-            self.update_program_list()
+        self.program_manager.run_program(program_path, params, position_name)
     
     def update_program_list(self):
         """Update CG list UI"""
@@ -251,16 +289,31 @@ class UIManager:
         program_id = item['values'][0]
         
         self.program_manager.terminate_program(program_id)
-        self.update_program_list()
     
     def terminate_all_programs(self):
         """Terminate all CGs"""
         self.program_manager.terminate_all_programs()
-        self.update_program_list()
+    
+    def update_manifest_threaded(self):
+        """Rebuild integrity manifest of the selected CG's directory in thread"""
+        import threading
+        
+        program_path = self.path_display.cget("text")
+        if program_path == self.config['ui']['add_program']['program_placeholder']:
+            self.logger.log(self.config_manager.get_message('errors.no_program_selected'))
+            return
+        
+        install_dir = os.path.dirname(os.path.abspath(program_path))
+        self.logger.log(self.config_manager.get_message('integrity.building_manifest', path=install_dir))
+        thread = threading.Thread(target=self.program_manager.integrity_manager.update_manifest, args=(install_dir,), daemon=True)
+        thread.start()
+    
+    def memory_report_threaded(self):
+        """Log memory diagnostics report in thread"""
+        import threading
+        
+        threading.Thread(target=self.memory_diagnostics.log_report, daemon=True).start()
     
     def log(self, message):
         """Add log message (thread-safe)"""
-        def update_log():
-            self.log_text.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {message}\n")
-            self.log_text.see(tk.END)
-        self.root.after(0, update_log) 
\ No newline at end of file
+        self.logger.log(message) 
\ No newline at end of file